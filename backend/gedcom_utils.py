@@ -1,46 +1,239 @@
 """GEDCOM file parsing and D3.js tree conversion utilities."""
 
+import io
+import mmap
+import os
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
-from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Callable, Iterator, TextIO
+from weakref import WeakKeyDictionary
 from gedcom.parser import Parser
+from gedcom.element.element import Element
+from rapidfuzz import fuzz, process
 from gedcom.element.individual import IndividualElement
 from gedcom.element.family import FamilyElement
+from gedcom.element.file import FileElement
+from gedcom.element.object import ObjectElement
 
 
 # ============================================================================
-# Helper: Find individual by ID or Name
+# Individual Index (lookups and relationship adjacency, built once per parser)
 # ============================================================================
 
-def find_individual_by_id(parser: Parser, person_id: str) -> IndividualElement | None:
-    """Find an individual element by their GEDCOM ID (pointer)."""
-    if not person_id.startswith('@'):
-        person_id = f"@{person_id}@"
+@dataclass(slots=True)
+class _IndividualIndex:
+    """Lookup tables for one parser, built in a single pass over its root records."""
+    by_id: dict[str, IndividualElement] = field(default_factory=dict)
+    # Root records by type, in file order (families keyed by pointer)
+    individuals: list[IndividualElement] = field(default_factory=list)
+    families: dict[str, FamilyElement] = field(default_factory=dict)
+    sources: list[Element] = field(default_factory=list)
+    # by_id plus bare IDs ("I1" alongside "@I1@") for find_individual_by_id
+    id_lookup: dict[str, IndividualElement] = field(default_factory=dict)
+    # Casefolded full name -> elements, plus (casefolded full name, element) in file order
+    name_map: dict[str, list[IndividualElement]] = field(default_factory=dict)
+    names: list[tuple[str, IndividualElement]] = field(default_factory=list)
+    # Casefolded full names aligned with `names`, used as fuzzy-match choices
+    name_choices: list[str] = field(default_factory=list)
+    # Family pointer -> {"HUSB" / "WIFE" / "CHIL" / "PARENTS": [individual pointers]}
+    family_members: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    # Individual pointer -> families they are a spouse in (FAMS), parents, children
+    fams_of: dict[str, list[str]] = field(default_factory=dict)
+    parents_of: dict[str, list[str]] = field(default_factory=dict)
+    children_of: dict[str, list[str]] = field(default_factory=dict)
+    # Pointers of everyone who is HUSB/WIFE in a family with at least one child
+    is_parent: set[str] = field(default_factory=set)
+    # Memoized get_individual_data() results keyed by pointer
+    data: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Memoized ancestor sets (including the start ID) for detect_circular_ancestry
+    ancestors: dict[str, frozenset[str]] = field(default_factory=dict)
+
+
+# Cached per parser; entries disappear with the parser and are dropped on writes
+_INDIV_INDEX: WeakKeyDictionary[Parser, _IndividualIndex] = WeakKeyDictionary()
+
+
+def _build_indiv_index(parser: Parser) -> _IndividualIndex:
+    """Build the individual index for a parser."""
+    index = _IndividualIndex()
+    by_id = index.by_id
     
     for element in parser.get_root_child_elements():
         if isinstance(element, IndividualElement):
-            if element.get_pointer() == person_id:
-                return element
-    return None
+            index.individuals.append(element)
+            pointer = element.get_pointer()
+            # First record wins for duplicate pointers, as in a linear scan
+            by_id.setdefault(pointer, element)
+            index.id_lookup.setdefault(pointer, element)
+            index.id_lookup.setdefault(pointer[1:-1], element)
+            first_name, last_name = element.get_name()
+            full_name = f"{first_name} {last_name}".strip().casefold()
+            index.name_map.setdefault(full_name, []).append(element)
+            index.names.append((full_name, element))
+            index.name_choices.append(full_name)
+        elif isinstance(element, FamilyElement):
+            index.families.setdefault(element.get_pointer(), element)
+        elif element.get_tag() == "SOUR":
+            index.sources.append(element)
+    
+    # Resolve HUSB/WIFE/CHIL references once per family
+    for family in index.families.values():
+        members = {"HUSB": [], "WIFE": [], "CHIL": [], "PARENTS": []}
+        for child in family.get_child_elements():
+            tag = child.get_tag()
+            if tag in ("HUSB", "WIFE", "CHIL"):
+                member_id = child.get_value()
+                if member_id in by_id:
+                    members[tag].append(member_id)
+                    if tag != "CHIL":
+                        members["PARENTS"].append(member_id)
+        index.family_members[family.get_pointer()] = members
+        if members["CHIL"]:
+            index.is_parent.update(members["PARENTS"])
+    
+    # Follow each individual's FAMC/FAMS links into the resolved families
+    for pointer, element in by_id.items():
+        fams, parents, children = [], [], []
+        for child in element.get_child_elements():
+            tag = child.get_tag()
+            if tag == "FAMC":
+                members = index.family_members.get(child.get_value())
+                if members:
+                    parents.extend(members["PARENTS"])
+            elif tag == "FAMS":
+                members = index.family_members.get(child.get_value())
+                if members:
+                    fams.append(child.get_value())
+                    children.extend(members["CHIL"])
+        index.fams_of[pointer] = fams
+        index.parents_of[pointer] = parents
+        index.children_of[pointer] = children
+    
+    return index
+
+
+def _get_indiv_index(parser: Parser) -> _IndividualIndex:
+    """Get the individual index for a parser, building it on first use."""
+    index = _INDIV_INDEX.get(parser)
+    if index is None:
+        index = _INDIV_INDEX[parser] = _build_indiv_index(parser)
+    return index
+
+
+def _get_cached_individual_data(parser: Parser, element: IndividualElement) -> dict[str, Any]:
+    """get_individual_data() memoized per parser. Returns a copy so callers may mutate it."""
+    return get_individual_data(element, _get_indiv_index(parser).data)
+
+
+def _individual_summary(index: _IndividualIndex, element: IndividualElement) -> dict[str, Any]:
+    """
+    get_individual_data() for a root individual, memoized in the index. A record
+    shadowed by an earlier one with the same pointer is not cached, so it keeps
+    its own data instead of the cached entry for that pointer.
+    """
+    cache = index.data if index.by_id.get(element.get_pointer()) is element else None
+    return get_individual_data(element, cache)
+
+
+def _invalidate_indiv_index(parser: Parser) -> None:
+    """Drop the cached individual index after records or links are added, removed or edited."""
+    _INDIV_INDEX.pop(parser, None)
+
+
+@dataclass(slots=True)
+class _RecordLookup:
+    """Root individual and family records by pointer, for the write helpers.
+
+    Only adding or removing records changes it, so unlike _IndividualIndex it
+    stays valid across link edits and is updated in place when records are added.
+    """
+    individuals: dict[str, IndividualElement] = field(default_factory=dict)
+    families: dict[str, FamilyElement] = field(default_factory=dict)
+
+
+_RECORD_LOOKUP: WeakKeyDictionary[Parser, _RecordLookup] = WeakKeyDictionary()
+
+
+def _get_record_lookup(parser: Parser) -> _RecordLookup:
+    """Return the cached record lookup for a parser, building it on first use."""
+    lookup = _RECORD_LOOKUP.get(parser)
+    if lookup is None:
+        lookup = _RecordLookup()
+        for element in parser.get_root_child_elements():
+            if isinstance(element, IndividualElement):
+                lookup.individuals.setdefault(element.get_pointer(), element)
+            elif isinstance(element, FamilyElement):
+                lookup.families.setdefault(element.get_pointer(), element)
+        _RECORD_LOOKUP[parser] = lookup
+    return lookup
+
+
+def _add_to_record_lookup(parser: Parser, element: Element) -> None:
+    """Register a newly added root record with the cached lookup, if any."""
+    lookup = _RECORD_LOOKUP.get(parser)
+    if lookup is None:
+        return
+    if isinstance(element, IndividualElement):
+        lookup.individuals.setdefault(element.get_pointer(), element)
+    elif isinstance(element, FamilyElement):
+        lookup.families.setdefault(element.get_pointer(), element)
+
+
+# ============================================================================
+# Helper: Find individual by ID or Name
+# ============================================================================
+
+def _normalize_id(gedcom_id: str) -> str:
+    """Return a GEDCOM ID in its "@I1@" pointer form."""
+    return gedcom_id if gedcom_id.startswith('@') else f"@{gedcom_id}@"
+
+
+def find_individual_by_id(parser: Parser, person_id: str) -> IndividualElement | None:
+    """Find an individual element by their GEDCOM ID (pointer), with or without the @s."""
+    return _get_indiv_index(parser).id_lookup.get(person_id)
+
+
+# Minimum rapidfuzz token_sort_ratio score (0-100) for a fuzzy name match
+_FUZZY_NAME_CUTOFF = 85
 
 
 def find_individual_by_name(parser: Parser, name: str) -> IndividualElement | None:
-    """Find an individual element by their name (case-insensitive partial match)."""
-    name_lower = name.lower().strip()
-    
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            first_name, last_name = element.get_name()
-            full_name = f"{first_name} {last_name}".strip().lower()
-            # Try exact match first
-            if full_name == name_lower:
-                return element
-            # Then try if the search name is contained in the full name
-            if name_lower in full_name:
-                return element
+    """
+    Find an individual element by their name (case-insensitive).
+    Tries an exact match, then a partial match, then the closest fuzzy match
+    so that misspelled names still resolve.
+    """
+    name_folded = name.casefold().strip()
+    index = _get_indiv_index(parser)
+    
+    # Try exact match first
+    exact = index.name_map.get(name_folded)
+    if exact:
+        return exact[0]
+    
+    # Then try if the search name is contained in the full name
+    for full_name, element in index.names:
+        if name_folded in full_name:
+            return element
+    
+    # Finally fall back to the closest fuzzy match (handles misspellings)
+    match = process.extractOne(
+        name_folded, index.name_choices, scorer=fuzz.token_sort_ratio, score_cutoff=_FUZZY_NAME_CUTOFF
+    )
+    if match:
+        return index.names[match[2]][1]
     return None
 
 
+# A short bare ID: starts with a letter and contains a digit (e.g. I1, P23)
+_SHORT_ID_RE = re.compile(r'[^\W\d_].*\d', re.DOTALL)
+
+
 def find_individual(parser: Parser, identifier: str) -> IndividualElement | None:
     """
     Find an individual by ID or name.
@@ -49,7 +242,7 @@ def find_individual(parser: Parser, identifier: str) -> IndividualElement | None
     # Check if it looks like an ID (starts with @ or is alphanumeric like I1, I23)
     identifier = identifier.strip()
     
-    if identifier.startswith('@') or (len(identifier) <= 10 and identifier[0].isalpha() and any(c.isdigit() for c in identifier)):
+    if identifier.startswith('@') or (len(identifier) <= 10 and _SHORT_ID_RE.match(identifier)):
         # Try as ID first
         result = find_individual_by_id(parser, identifier)
         if result:
@@ -63,6 +256,21 @@ def find_individual(parser: Parser, identifier: str) -> IndividualElement | None
 # Extended Individual Data (with more metadata)
 # ============================================================================
 
+# Tags reported as custom facts in get_person_full_details
+_INTERESTING_TAGS = frozenset(("EDUC", "RELI", "NATI", "TITL", "FACT", "EVEN"))
+
+# A standalone 4-digit token in a GEDCOM date string (e.g. "ABT 1901")
+_YEAR_RE = re.compile(r'(?<!\S)(\d{4})(?!\S)')
+
+
+def _extract_year(date_str: str | None) -> int | None:
+    """Return the first 4-digit year in a date string, or None."""
+    if not date_str:
+        return None
+    match = _YEAR_RE.search(date_str)
+    return int(match.group(1)) if match else None
+
+
 def get_person_full_details(parser: Parser, person_id: str) -> dict[str, Any] | str:
     """
     Get comprehensive details about a person including all available metadata.
@@ -73,65 +281,46 @@ def get_person_full_details(parser: Parser, person_id: str) -> dict[str, Any] |
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    first_name, last_name = individual.get_name()
-    birth_year = individual.get_birth_year()
-    
-    # Death data
-    death_year = None
-    death_place = None
-    death_data = individual.get_death_data()
-    if death_data:
-        if death_data[0]:
-            for part in death_data[0].split():
-                if part.isdigit() and len(part) == 4:
-                    death_year = int(part)
-                    break
-        if len(death_data) > 1:
-            death_place = death_data[1]
-    
-    # Birth data
-    birth_place = None
-    birth_data = individual.get_birth_data()
-    if birth_data and len(birth_data) > 1:
-        birth_place = birth_data[1]
+    return _person_full_details(parser, individual)
+
+
+def _person_full_details(parser: Parser, individual: IndividualElement) -> dict[str, Any]:
+    """get_person_full_details() for an already resolved individual."""
+    # Names, years and birth place come from the cached summary, so dates are
+    # parsed once per index build rather than on every lookup
+    summary = _individual_summary(_get_indiv_index(parser), individual)
     
-    # Occupation
+    # Death place, occupation, notes and custom facts (other interesting tags)
+    # in one pass; like get_death_data, the last DEAT PLAC wins
+    death_place = ""
     occupation = None
-    for child in individual.get_child_elements():
-        if child.get_tag() == "OCCU":
-            occupation = child.get_value()
-            break
-    
-    # Notes
     notes = []
-    for child in individual.get_child_elements():
-        if child.get_tag() == "NOTE":
-            note_value = child.get_value()
-            if note_value:
-                notes.append(note_value)
-    
-    # Custom facts (other interesting tags)
     custom_facts = {}
-    interesting_tags = ["EDUC", "RELI", "NATI", "TITL", "FACT", "EVEN"]
     for child in individual.get_child_elements():
         tag = child.get_tag()
-        if tag in interesting_tags:
-            value = child.get_value()
+        value = child.get_value()
+        if tag == "OCCU":
+            if occupation is None:
+                occupation = value
+        elif tag == "NOTE":
             if value:
-                if tag in custom_facts:
-                    custom_facts[tag].append(value)
-                else:
-                    custom_facts[tag] = [value]
+                notes.append(value)
+        elif tag == "DEAT":
+            for sub in child.get_child_elements():
+                if sub.get_tag() == "PLAC":
+                    death_place = sub.get_value()
+        elif tag in _INTERESTING_TAGS and value:
+            custom_facts.setdefault(tag, []).append(value)
     
     return {
-        "id": individual.get_pointer(),
-        "firstName": first_name,
-        "lastName": last_name,
-        "fullName": f"{first_name} {last_name}".strip(),
-        "gender": individual.get_gender(),
-        "birthYear": birth_year if birth_year != -1 else None,
-        "birthPlace": birth_place,
-        "deathYear": death_year,
+        "id": summary["id"],
+        "firstName": summary["firstName"],
+        "lastName": summary["lastName"],
+        "fullName": summary["fullName"],
+        "gender": summary["gender"],
+        "birthYear": summary["birthYear"],
+        "birthPlace": summary["birthPlace"],
+        "deathYear": summary["deathYear"],
         "deathPlace": death_place,
         "occupation": occupation,
         "notes": notes,
@@ -149,8 +338,11 @@ def get_parents(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    parents = parser.get_parents(individual)
-    return [get_individual_data(p) for p in parents if isinstance(p, IndividualElement)]
+    index = _get_indiv_index(parser)
+    return [
+        _get_cached_individual_data(parser, index.by_id[parent_id])
+        for parent_id in index.parents_of[individual.get_pointer()]
+    ]
 
 
 def get_children(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
@@ -159,13 +351,11 @@ def get_children(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    children = []
-    for family in parser.get_families(individual):
-        if isinstance(family, FamilyElement):
-            for child in parser.get_family_members(family, "CHIL"):
-                if isinstance(child, IndividualElement):
-                    children.append(get_individual_data(child))
-    return children
+    index = _get_indiv_index(parser)
+    return [
+        _get_cached_individual_data(parser, index.by_id[child_id])
+        for child_id in index.children_of[individual.get_pointer()]
+    ]
 
 
 def get_spouses(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
@@ -174,24 +364,26 @@ def get_spouses(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
+    index = _get_indiv_index(parser)
+    pointer = individual.get_pointer()
     gender = individual.get_gender()
     spouses = []
     
-    for family in parser.get_families(individual):
-        if isinstance(family, FamilyElement):
-            # If person is husband, get wife; if wife, get husband
-            spouse_role = "WIFE" if gender == "M" else "HUSB"
-            for spouse in parser.get_family_members(family, spouse_role):
-                if isinstance(spouse, IndividualElement):
-                    spouses.append(get_individual_data(spouse))
-            # Also check the other role in case gender is unknown
-            if gender not in ("M", "F"):
-                for spouse in parser.get_family_members(family, "HUSB"):
-                    if isinstance(spouse, IndividualElement) and spouse != individual:
-                        spouses.append(get_individual_data(spouse))
-                for spouse in parser.get_family_members(family, "WIFE"):
-                    if isinstance(spouse, IndividualElement) and spouse != individual:
-                        spouses.append(get_individual_data(spouse))
+    # If person is husband, get wife; if wife, get husband; check both
+    # roles when gender is unknown
+    if gender == "M":
+        spouse_roles = ("WIFE",)
+    elif gender == "F":
+        spouse_roles = ("HUSB",)
+    else:
+        spouse_roles = ("HUSB", "WIFE")
+    
+    for family_id in index.fams_of[pointer]:
+        members = index.family_members[family_id]
+        for role in spouse_roles:
+            for spouse_id in members[role]:
+                if spouse_id != pointer:
+                    spouses.append(_get_cached_individual_data(parser, index.by_id[spouse_id]))
     
     return spouses
 
@@ -202,51 +394,73 @@ def get_siblings(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
+    index = _get_indiv_index(parser)
     siblings = []
     person_pointer = individual.get_pointer()
     
-    # Get parents first
-    parents = parser.get_parents(individual)
-    
-    if not parents:
-        return []  # No parents means no siblings
-    
     # Find all children of each parent
     seen_ids = {person_pointer}
-    for parent in parents:
-        if isinstance(parent, IndividualElement):
-            for family in parser.get_families(parent):
-                if isinstance(family, FamilyElement):
-                    for child in parser.get_family_members(family, "CHIL"):
-                        if isinstance(child, IndividualElement):
-                            child_id = child.get_pointer()
-                            if child_id not in seen_ids:
-                                seen_ids.add(child_id)
-                                siblings.append(get_individual_data(child))
+    for parent_id in index.parents_of[person_pointer]:
+        for child_id in index.children_of[parent_id]:
+            if child_id not in seen_ids:
+                seen_ids.add(child_id)
+                siblings.append(_get_cached_individual_data(parser, index.by_id[child_id]))
     
     return siblings
 
 
+def _grandparent_ids(parents_of: dict[str, list[str]], pointer: str) -> list[str]:
+    """Pointers of a person's grandparents, in walk order without duplicates."""
+    result = []
+    seen = set()
+    for parent_id in parents_of[pointer]:
+        for gp_id in parents_of[parent_id]:
+            if gp_id not in seen:
+                seen.add(gp_id)
+                result.append(gp_id)
+    return result
+
+
+def _aunt_uncle_ids(
+    parents_of: dict[str, list[str]], children_of: dict[str, list[str]], pointer: str
+) -> list[str]:
+    """Pointers of a person's aunts and uncles (the other children of each parent's parents)."""
+    result = []
+    seen = set()
+    for parent_id in parents_of[pointer]:
+        for gp_id in parents_of[parent_id]:
+            for sib_id in children_of[gp_id]:
+                if sib_id != parent_id and sib_id not in seen:
+                    seen.add(sib_id)
+                    result.append(sib_id)
+    return result
+
+
+def _cousin_ids(
+    parents_of: dict[str, list[str]], children_of: dict[str, list[str]], pointer: str
+) -> list[str]:
+    """Pointers of a person's first cousins, excluding the person themselves."""
+    result = []
+    seen = {pointer}
+    for au_id in _aunt_uncle_ids(parents_of, children_of, pointer):
+        for child_id in children_of[au_id]:
+            if child_id not in seen:
+                seen.add(child_id)
+                result.append(child_id)
+    return result
+
+
 def get_grandparents(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     """Get grandparents of a person. Returns list of grandparent dicts or error message."""
     individual = find_individual(parser, person_id)
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    grandparents = []
-    seen_ids = set()
-    
-    parents = parser.get_parents(individual)
-    for parent in parents:
-        if isinstance(parent, IndividualElement):
-            for grandparent in parser.get_parents(parent):
-                if isinstance(grandparent, IndividualElement):
-                    gp_id = grandparent.get_pointer()
-                    if gp_id not in seen_ids:
-                        seen_ids.add(gp_id)
-                        grandparents.append(get_individual_data(grandparent))
-    
-    return grandparents
+    index = _get_indiv_index(parser)
+    return [
+        _get_cached_individual_data(parser, index.by_id[gp_id])
+        for gp_id in _grandparent_ids(index.parents_of, individual.get_pointer())
+    ]
 
 
 def get_aunts_uncles(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
@@ -255,23 +469,11 @@ def get_aunts_uncles(parser: Parser, person_id: str) -> list[dict[str, Any]] | s
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    aunts_uncles = []
-    seen_ids = set()
-    
-    parents = parser.get_parents(individual)
-    for parent in parents:
-        if isinstance(parent, IndividualElement):
-            parent_id = parent.get_pointer()
-            # Get siblings of this parent
-            parent_siblings_result = get_siblings(parser, parent_id)
-            if isinstance(parent_siblings_result, list):
-                for sibling in parent_siblings_result:
-                    sib_id = sibling["id"]
-                    if sib_id not in seen_ids:
-                        seen_ids.add(sib_id)
-                        aunts_uncles.append(sibling)
-    
-    return aunts_uncles
+    index = _get_indiv_index(parser)
+    return [
+        _get_cached_individual_data(parser, index.by_id[au_id])
+        for au_id in _aunt_uncle_ids(index.parents_of, index.children_of, individual.get_pointer())
+    ]
 
 
 def get_cousins(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
@@ -280,23 +482,11 @@ def get_cousins(parser: Parser, person_id: str) -> list[dict[str, Any]] | str:
     if not individual:
         return f"Person not found: '{person_id}'. Please use a valid GEDCOM ID (e.g., '@I1@') or the person's full name."
     
-    cousins = []
-    seen_ids = set()
-    
-    aunts_uncles = get_aunts_uncles(parser, person_id)
-    if isinstance(aunts_uncles, str):
-        return aunts_uncles  # Error message
-    
-    for au in aunts_uncles:
-        au_children = get_children(parser, au["id"])
-        if isinstance(au_children, list):
-            for child in au_children:
-                child_id = child["id"]
-                if child_id not in seen_ids:
-                    seen_ids.add(child_id)
-                    cousins.append(child)
-    
-    return cousins
+    index = _get_indiv_index(parser)
+    return [
+        _get_cached_individual_data(parser, index.by_id[cousin_id])
+        for cousin_id in _cousin_ids(index.parents_of, index.children_of, individual.get_pointer())
+    ]
 
 
 # ============================================================================
@@ -331,15 +521,14 @@ def update_person_metadata(
         "changes": []
     }
     
-    # Helper to add or update a tag
-    def set_tag_value(tag: str, value: str, old_value: str | None):
-        from gedcom.element.element import Element
-        # Find existing tag
-        existing = None
-        for child in individual.get_child_elements():
-            if child.get_tag() == tag:
-                existing = child
-                break
+    # First child element for each tag, gathered in one pass
+    first_by_tag = {}
+    for child in individual.get_child_elements():
+        first_by_tag.setdefault(child.get_tag(), child)
+    
+    # Helper to add or update a tag (records the existing value for undo)
+    def set_tag_value(tag: str, value: str):
+        existing = first_by_tag.get(tag)
         
         if existing:
             # Store old value for undo
@@ -359,32 +548,19 @@ def update_person_metadata(
                 "new_value": value
             })
             # Create and add new child element
-            new_element = Element(level=1, pointer="", tag=tag, value=value)
+            new_element = _new_element(level=1, tag=tag, value=value)
             individual.add_child_element(new_element)
+            first_by_tag[tag] = new_element
     
     if notes is not None:
-        # Get existing notes
-        old_notes = []
-        for child in individual.get_child_elements():
-            if child.get_tag() == "NOTE":
-                old_notes.append(child.get_value())
-        set_tag_value("NOTE", notes, "; ".join(old_notes) if old_notes else None)
+        set_tag_value("NOTE", notes)
     
     if occupation is not None:
-        old_occu = None
-        for child in individual.get_child_elements():
-            if child.get_tag() == "OCCU":
-                old_occu = child.get_value()
-                break
-        set_tag_value("OCCU", occupation, old_occu)
+        set_tag_value("OCCU", occupation)
     
     if birth_place is not None:
         # Birth place is stored under BIRT > PLAC
-        birth_elem = None
-        for child in individual.get_child_elements():
-            if child.get_tag() == "BIRT":
-                birth_elem = child
-                break
+        birth_elem = first_by_tag.get("BIRT")
         
         if birth_elem:
             old_place = None
@@ -404,17 +580,12 @@ def update_person_metadata(
             if plac_elem:
                 plac_elem.set_value(birth_place)
             else:
-                from gedcom.element.element import Element
-                new_plac = Element(level=2, pointer="", tag="PLAC", value=birth_place)
+                new_plac = _new_element(level=2, tag="PLAC", value=birth_place)
                 birth_elem.add_child_element(new_plac)
     
     if death_place is not None:
         # Death place is stored under DEAT > PLAC
-        death_elem = None
-        for child in individual.get_child_elements():
-            if child.get_tag() == "DEAT":
-                death_elem = child
-                break
+        death_elem = first_by_tag.get("DEAT")
         
         if death_elem:
             old_place = None
@@ -434,19 +605,15 @@ def update_person_metadata(
             if plac_elem:
                 plac_elem.set_value(death_place)
             else:
-                from gedcom.element.element import Element
-                new_plac = Element(level=2, pointer="", tag="PLAC", value=death_place)
+                new_plac = _new_element(level=2, tag="PLAC", value=death_place)
                 death_elem.add_child_element(new_plac)
     
     if custom_facts:
         for tag, value in custom_facts.items():
-            tag_upper = tag.upper()
-            old_val = None
-            for child in individual.get_child_elements():
-                if child.get_tag() == tag_upper:
-                    old_val = child.get_value()
-                    break
-            set_tag_value(tag_upper, value, old_val)
+            set_tag_value(tag.upper(), value)
+    
+    # Cached individual data (e.g. birthPlace) may now be stale
+    _invalidate_indiv_index(parser)
     
     return changes
 
@@ -461,6 +628,14 @@ def apply_undo(parser: Parser, change_record: dict[str, Any]) -> str:
     if not individual:
         return f"Person not found: {person_id}"
     
+    # (position, element) for each child, grouped by tag in document order
+    children = individual.get_child_elements()
+    children_by_tag: dict[str, list[tuple[int, Element]]] = {}
+    for position, child in enumerate(children):
+        children_by_tag.setdefault(child.get_tag(), []).append((position, child))
+    # Positions of children to delete once all changes are applied
+    removed = []
+    
     for change in change_record.get("changes", []):
         field = change["field"]
         old_value = change["old_value"]
@@ -468,31 +643,35 @@ def apply_undo(parser: Parser, change_record: dict[str, Any]) -> str:
         # Handle nested fields like BIRT.PLAC
         if "." in field:
             parent_tag, child_tag = field.split(".", 1)
-            parent_elem = None
-            for child in individual.get_child_elements():
-                if child.get_tag() == parent_tag:
-                    parent_elem = child
-                    break
+            parent_elems = children_by_tag.get(parent_tag)
             
-            if parent_elem:
-                for sub in parent_elem.get_child_elements():
+            if parent_elems:
+                subs = parent_elems[0][1].get_child_elements()
+                for i, sub in enumerate(subs):
                     if sub.get_tag() == child_tag:
                         if old_value is None:
                             # Remove the element (if we added it)
-                            parent_elem.get_child_elements().remove(sub)
+                            del subs[i]
                         else:
                             sub.set_value(old_value)
                         break
         else:
             # Simple tag
-            for child in individual.get_child_elements():
-                if child.get_tag() == field:
-                    if old_value is None:
-                        # Remove the element
-                        individual.get_child_elements().remove(child)
-                    else:
-                        child.set_value(old_value)
-                    break
+            matches = children_by_tag.get(field)
+            if matches:
+                position, child = matches[0]
+                if old_value is None:
+                    # Remove the element
+                    removed.append(position)
+                    del matches[0]
+                else:
+                    child.set_value(old_value)
+    
+    # Delete from the end so earlier positions stay valid
+    for position in sorted(removed, reverse=True):
+        del children[position]
+    
+    _invalidate_indiv_index(parser)
     
     return f"Successfully undid changes for {person_id}"
 
@@ -501,9 +680,22 @@ def apply_undo(parser: Parser, change_record: dict[str, Any]) -> str:
 # Transaction-Based Undo System
 # ============================================================================
 
-# Global transaction state
-_active_transaction = None
-_transaction_operations = []
+@dataclass(slots=True)
+class Transaction:
+    """An in-progress transaction and the operations recorded against it."""
+    id: str
+    description: str
+    started_at: str
+    operations: list[dict[str, Any]] = field(default_factory=list)
+
+    def info(self) -> dict[str, Any]:
+        """Return the id/description/started_at summary reported by begin and commit."""
+        return {"id": self.id, "description": self.description, "started_at": self.started_at}
+
+
+# Global transaction state (shared across tool calls, which begin and
+# commit a transaction from separate requests)
+_active_transaction: Transaction | None = None
 
 
 def begin_transaction(description: str = "Transaction") -> dict[str, Any]:
@@ -516,21 +708,18 @@ def begin_transaction(description: str = "Transaction") -> dict[str, Any]:
     Returns:
         dict: Transaction info with 'id' and 'description'
     """
-    global _active_transaction, _transaction_operations
+    global _active_transaction
     
     if _active_transaction is not None:
-        raise RuntimeError(f"Transaction already in progress: {_active_transaction['description']}")
-    
-    transaction_id = f"txn_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        raise RuntimeError(f"Transaction already in progress: {_active_transaction.description}")
     
-    _active_transaction = {
-        "id": transaction_id,
-        "description": description,
-        "started_at": datetime.now().isoformat()
-    }
-    _transaction_operations = []
+    _active_transaction = Transaction(
+        id=f"txn_{time.time_ns()}",
+        description=description,
+        started_at=datetime.now().isoformat()
+    )
     
-    return _active_transaction
+    return _active_transaction.info()
 
 
 def record_operation(operation: dict[str, Any]) -> None:
@@ -540,13 +729,11 @@ def record_operation(operation: dict[str, Any]) -> None:
     Args:
         operation: dict with operation details for undo
     """
-    global _transaction_operations
-    
     if _active_transaction is None:
         # Not in a transaction, skip
         return
     
-    _transaction_operations.append(operation)
+    _active_transaction.operations.append(operation)
 
 
 def commit_transaction() -> dict[str, Any]:
@@ -556,40 +743,39 @@ def commit_transaction() -> dict[str, Any]:
     Returns:
         dict: Complete transaction record for undo
     """
-    global _active_transaction, _transaction_operations
+    global _active_transaction
     
     if _active_transaction is None:
         raise RuntimeError("No active transaction to commit")
     
-    transaction_record = {
-        **_active_transaction,
-        "operations": _transaction_operations.copy(),
-        "committed_at": datetime.now().isoformat(),
-        "operation_count": len(_transaction_operations)
-    }
-    
-    # Clear transaction state
+    transaction = _active_transaction
+    # Clear transaction state; the record takes ownership of the operations
     _active_transaction = None
-    _transaction_operations = []
     
-    return transaction_record
+    return {
+        **transaction.info(),
+        "operations": transaction.operations,
+        "committed_at": datetime.now().isoformat(),
+        "operation_count": len(transaction.operations)
+    }
 
 
 def rollback_transaction() -> None:
     """Rollback (cancel) the current transaction without saving."""
-    global _active_transaction, _transaction_operations
+    global _active_transaction
     
     if _active_transaction is None:
         raise RuntimeError("No active transaction to rollback")
     
     _active_transaction = None
-    _transaction_operations = []
 
 
 def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -> dict[str, Any]:
     """
     Undo an entire transaction by reversing all operations.
-    Operations are reversed in LIFO order (last operation first).
+    Edits to existing records are reversed in LIFO order (last operation
+    first); added individuals, sources and families are then removed together
+    in a single pass over the root records. Errors are reported in LIFO order.
     
     Args:
         parser: GEDCOM parser
@@ -598,9 +784,20 @@ def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -
     Returns:
         dict with 'success', 'operations_undone', and optional 'errors'
     """
+    # Error messages in LIFO order; added records hold a (kind, pointer)
+    # placeholder until the batched removal shows whether they were found
     errors = []
     operations_undone = 0
     
+    # Removed citations (by element id) and the child lists holding them
+    dead_citations = set()
+    citation_lists = {}
+    
+    # Added records to drop, grouped by type: pointer -> operation
+    individuals_to_remove = {}
+    sources_to_remove = {}
+    families_to_remove = {}
+    
     # Reverse operations (LIFO)
     operations = list(reversed(transaction_record.get("operations", [])))
     
@@ -609,28 +806,23 @@ def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -
         
         try:
             if op_type == "add_individual":
-                # Remove the added individual
                 person_id = operation.get("person_id")
-                individual = find_individual_by_id(parser, person_id)
-                if individual:
-                    parser.get_root_element().get_child_elements().remove(individual)
-                    operations_undone += 1
+                if person_id:
+                    person_id = _normalize_id(person_id)
+                    individuals_to_remove[person_id] = operation
+                    errors.append(("person", person_id))
                 else:
-                    errors.append(f"Could not find person to remove: {person_id}")
+                    errors.append("Could not find person to remove: missing person_id")
             
             elif op_type == "add_source":
-                # Remove the added source
                 source_id = operation.get("source_id")
-                source_elem = None
-                for element in parser.get_root_child_elements():
-                    if element.get_tag() == "SOUR" and element.get_pointer() == source_id:
-                        source_elem = element
-                        break
-                if source_elem:
-                    parser.get_root_element().get_child_elements().remove(source_elem)
-                    operations_undone += 1
-                else:
-                    errors.append(f"Could not find source to remove: {source_id}")
+                sources_to_remove[source_id] = operation
+                errors.append(("source", source_id))
+            
+            elif op_type == "add_family":
+                family_id = operation.get("family_id")
+                families_to_remove[family_id] = operation
+                errors.append(("family", family_id))
             
             elif op_type == "attach_source":
                 # Remove the source citation
@@ -639,47 +831,23 @@ def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -
                 individual = find_individual_by_id(parser, person_id)
                 
                 if individual:
-                    # Find the event and remove the SOUR element
+                    # Find the event and tombstone the most recent matching
+                    # SOUR citation; event lists are compacted after the loop
+                    source_id = operation.get("source_id")
                     for child in individual.get_child_elements():
                         if child.get_tag() == event_type:
-                            # Find and remove SOUR child
-                            sour_to_remove = None
-                            for sub in child.get_child_elements():
-                                if sub.get_tag() == "SOUR":
-                                    sour_to_remove = sub
+                            subs = child.get_child_elements()
+                            for sub in reversed(subs):
+                                if (sub.get_tag() == "SOUR" and id(sub) not in dead_citations
+                                        and (source_id is None or sub.get_value() == source_id)):
+                                    dead_citations.add(id(sub))
+                                    citation_lists[id(subs)] = subs
+                                    operations_undone += 1
                                     break
-                            if sour_to_remove:
-                                child.get_child_elements().remove(sour_to_remove)
-                                operations_undone += 1
                             break
                 else:
                     errors.append(f"Could not find person for source removal: {person_id}")
             
-            elif op_type == "add_family":
-                # Remove the added family
-                family_id = operation.get("family_id")
-                family_elem = None
-                for element in parser.get_root_child_elements():
-                    if isinstance(element, FamilyElement) and element.get_pointer() == family_id:
-                        family_elem = element
-                        break
-                if family_elem:
-                    parser.get_root_element().get_child_elements().remove(family_elem)
-                    operations_undone += 1
-                    
-                    # Remove FAMC/FAMS references from individuals
-                    for ref_id in operation.get("referenced_individuals", []):
-                        individual = find_individual_by_id(parser, ref_id)
-                        if individual:
-                            refs_to_remove = []
-                            for child in individual.get_child_elements():
-                                if child.get_tag() in ("FAMC", "FAMS") and child.get_value() == family_id:
-                                    refs_to_remove.append(child)
-                            for ref in refs_to_remove:
-                                individual.get_child_elements().remove(ref)
-                else:
-                    errors.append(f"Could not find family to remove: {family_id}")
-            
             elif op_type == "update_metadata":
                 # Use existing apply_undo for metadata changes
                 result = apply_undo(parser, operation.get("change_record", {}))
@@ -694,6 +862,29 @@ def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -
         except Exception as e:
             errors.append(f"Error undoing operation {op_type}: {str(e)}")
     
+    for subs in citation_lists.values():
+        subs[:] = [sub for sub in subs if id(sub) not in dead_citations]
+    
+    removed = {"person": set(), "source": set(), "family": set()}
+    if individuals_to_remove or sources_to_remove or families_to_remove:
+        removed["person"], removed["source"], removed["family"] = _remove_added_records(
+            parser, individuals_to_remove, sources_to_remove, families_to_remove
+        )
+    
+    # Resolve placeholders in place; each removed record counts once, so a
+    # repeated add of the same pointer reports it as already gone
+    resolved = []
+    for error in errors:
+        if isinstance(error, tuple):
+            kind, record_id = error
+            if record_id in removed[kind]:
+                removed[kind].discard(record_id)
+                operations_undone += 1
+                continue
+            error = f"Could not find {kind} to remove: {record_id}"
+        resolved.append(error)
+    errors = resolved
+    
     return {
         "success": len(errors) == 0,
         "operations_undone": operations_undone,
@@ -701,98 +892,351 @@ def apply_transaction_undo(parser: Parser, transaction_record: dict[str, Any]) -
     }
 
 
+def _remove_added_records(
+    parser: Parser,
+    individuals_to_remove: dict[str, dict[str, Any]],
+    sources_to_remove: dict[str, dict[str, Any]],
+    families_to_remove: dict[str, dict[str, Any]]
+) -> tuple[set[str], set[str], set[str]]:
+    """
+    Remove records added by a transaction in one pass over the root records.
+    Returns the pointers of the individuals, sources and families that were
+    found and removed.
+    """
+    index = _get_indiv_index(parser)
+    
+    # Resolve the records through the index's typed lookups, then drop them
+    # from the root list by identity
+    sources_by_id = {source.get_pointer(): source for source in index.sources}
+    removed_individuals = {pid for pid in individuals_to_remove if pid in index.by_id}
+    removed_sources = {sid for sid in sources_to_remove if sid in sources_by_id}
+    removed_families = {fid for fid in families_to_remove if fid in index.families}
+    dead = {id(index.by_id[pid]) for pid in removed_individuals}
+    dead.update(id(sources_by_id[sid]) for sid in removed_sources)
+    dead.update(id(index.families[fid]) for fid in removed_families)
+    
+    root_children = parser.get_root_child_elements()
+    root_children[:] = [element for element in root_children if id(element) not in dead]
+    
+    # Remove FAMC/FAMS references to the removed families from individuals
+    for family_id, operation in families_to_remove.items():
+        if family_id not in removed_families:
+            continue
+        for ref_id in operation.get("referenced_individuals", []):
+            individual = index.by_id.get(ref_id)
+            if individual:
+                children = individual.get_child_elements()
+                children[:] = [
+                    child for child in children
+                    if not (child.get_tag() in ("FAMC", "FAMS") and child.get_value() in removed_families)
+                ]
+    
+    parser.invalidate_cache()
+    _invalidate_indiv_index(parser)
+    # Removed IDs become free again, as they would be after a fresh scan
+    _MAX_IDS.pop(parser, None)
+    _RECORD_LOOKUP.pop(parser, None)
+    
+    return removed_individuals, removed_sources, removed_families
+
+
 # ============================================================================
 # Export GEDCOM
 # ============================================================================
 
-def export_gedcom_content(parser: Parser) -> str:
-    """Export the current GEDCOM parser state to a string."""
-    lines = []
+# "0 ", "1 ", ... line prefixes for export; GEDCOM levels stay below 100
+_LEVEL_PREFIXES = tuple(f"{level} " for level in range(100))
+
+
+def export_gedcom_content(parser: Parser, out: TextIO | None = None) -> str | None:
+    """
+    Export the current GEDCOM parser state to a string.
+    If `out` is given, the lines are written to it instead (e.g. an open file)
+    and None is returned, so a large tree is never held in memory as one string.
+    """
+    buffer = io.StringIO() if out is None else out
+    write = buffer.write
     
-    def element_to_lines(element, level=0):
-        """Recursively convert an element to GEDCOM lines."""
-        pointer = element.get_pointer() or ""
-        tag = element.get_tag()
-        value = element.get_value() or ""
+    # Depth-first walk with an explicit stack; levels are recomputed from depth
+    root = parser.get_root_element()
+    stack = [(child, 0) for child in reversed(root.get_child_elements())]
+    first_line = True
+    
+    while stack:
+        element, level = stack.pop()
+        if not first_line:
+            write("\n")
+        first_line = False
         
+        write(_LEVEL_PREFIXES[level] if level < 100 else f"{level} ")
+        pointer = element.get_pointer()
         if pointer:
-            line = f"{level} {pointer} {tag}"
-        else:
-            line = f"{level} {tag}"
-        
+            write(pointer)
+            write(" ")
+        write(element.get_tag())
+        value = element.get_value()
         if value:
-            line += f" {value}"
+            write(" ")
+            write(value)
         
-        lines.append(line)
-        
-        for child in element.get_child_elements():
-            element_to_lines(child, level + 1)
+        children = element.get_child_elements()
+        if children:
+            stack.extend((child, level + 1) for child in reversed(children))
     
-    # Get root element and iterate through children
-    root = parser.get_root_element()
-    for child in root.get_child_elements():
-        element_to_lines(child, 0)
-    
-    return "\n".join(lines)
+    return buffer.getvalue() if out is None else None
+
+
+# Same grammar python-gedcom matches each line against, compiled once instead
+# of being rebuilt and looked up in the re cache for every line.
+_GEDCOM_LINE_RE = re.compile(
+    '^(0|[1-9]+[0-9]*) (@[^@]+@ |)([A-Za-z0-9_]+)( [^\n\r]*|)([\r\n]{1,2})'
+)
+
+_ELEMENT_CLASSES = {
+    "INDI": IndividualElement,
+    "FAM": FamilyElement,
+    "FILE": FileElement,
+    "OBJE": ObjectElement,
+}
+
+
+def _parse_gedcom_line(line_number, line, last_element, strict=True):
+    """Fast path for Parser.__parse_line on well-formed lines.
+
+    Builds the same element as python-gedcom; lines that need its quirk
+    handling (no EOL, stray continuation text) are handed back to it.
+    """
+    match = _GEDCOM_LINE_RE.match(line)
+    if match is None:
+        return Parser._Parser__parse_line(line_number, line, last_element, strict)
+
+    level_str, pointer, tag, value, crlf = match.groups()
+    level = int(level_str)
+    if level > last_element.get_level() + 1:
+        return Parser._Parser__parse_line(line_number, line, last_element, strict)
+
+    # Tags come from a tiny vocabulary and pointers are repeated by every
+    # HUSB/WIFE/CHIL/FAMC/FAMS reference, so share one string object each.
+    tag = sys.intern(tag)
+    pointer = sys.intern(pointer[:-1]) if pointer else pointer
+    value = value[1:]
+    if value[:1] == '@':
+        value = sys.intern(value)
+
+    element = _ELEMENT_CLASSES.get(tag, Element)(
+        level, pointer, tag, value, crlf, multi_line=False
+    )
+
+    parent_element = last_element
+    while parent_element.get_level() > level - 1:
+        parent_element = parent_element.get_parent_element()
+    parent_element.add_child_element(element)
+    return element
+
+
+class _GedcomParser(Parser):
+    """python-gedcom Parser with a precompiled line tokenizer.
+
+    The element tree is unchanged, so every Parser method and write helper
+    keeps working on the result.
+    """
+
+    _Parser__parse_line = staticmethod(_parse_gedcom_line)
 
 
 def parse_gedcom_file(file_path: str) -> Parser:
     """Parse a GEDCOM file and return the parser."""
-    parser = Parser()
-    parser.parse_file(file_path, strict=False)
+    parser = _GedcomParser()
+    with open(file_path, 'rb') as gedcom_stream:
+        if os.fstat(gedcom_stream.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            parser.parse(gedcom_stream, strict=False)
+            return parser
+        # Read lines from the page cache instead of copying the file into
+        # Python buffers; the parser decodes each line itself.
+        with mmap.mmap(gedcom_stream.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            parser.parse(iter(mm.readline, b''), strict=False)
     return parser
 
 
+def _iter_gedcom_lines(content: str):
+    """Yield UTF-8 encoded lines of GEDCOM content, newline included."""
+    start = 0
+    while True:
+        end = content.find("\n", start)
+        if end == -1:
+            if start < len(content):
+                yield content[start:].encode("utf-8")
+            return
+        yield content[start:end + 1].encode("utf-8")
+        start = end + 1
+
+
 def parse_gedcom_content(content: str) -> Parser:
     """Parse GEDCOM content from a string."""
-    import tempfile
-    import os
-    
-    # Write content to temp file (python-gedcom requires file path)
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.ged', delete=False, encoding='utf-8') as f:
-        f.write(content)
-        temp_path = f.name
-    
+    # Feed lines straight into the parser instead of round-tripping through
+    # a temp file; Parser.parse() expects byte lines like a binary file.
+    parser = _GedcomParser()
+    parser.parse(_iter_gedcom_lines(content), strict=False)
+    return parser
+
+
+def get_individual_data(
+    element: IndividualElement, cache: dict[str, dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """
+    Extract data from an individual element.
+    If a cache dict is given, results are memoized in it by pointer and a
+    copy is returned so callers may add keys (e.g. "children").
+    """
+    if cache is not None:
+        cached = cache.get(element.get_pointer())
+        if cached is not None:
+            return dict(cached)
+    
+    # One pass over the record's children, reading the same values (first
+    # usable NAME, last SEX, last BIRT/DEAT DATE and PLAC) as python-gedcom's
+    # get_name/get_gender/get_birth_year/get_birth_data/get_death_data, each
+    # of which would otherwise walk the children separately
+    first_name = last_name = gender = birth_place = death_date = ""
+    birth_token = ""
+    name_done = found_given = found_surname = False
+    for child in element.get_child_elements():
+        tag = child.get_tag()
+        if tag == "NAME":
+            if name_done:
+                continue
+            value = child.get_value()
+            if value != "":
+                # Name in the NAME value itself ("Given /Surname/")
+                name = value.split('/')
+                first_name = name[0].strip()
+                if len(name) > 1:
+                    last_name = name[1].strip()
+                name_done = True
+                continue
+            for sub in child.get_child_elements():
+                sub_tag = sub.get_tag()
+                if sub_tag == "GIVN":
+                    first_name = sub.get_value()
+                    found_given = True
+                if sub_tag == "SURN":
+                    last_name = sub.get_value()
+                    found_surname = True
+            name_done = found_given and found_surname
+        elif tag == "SEX":
+            gender = child.get_value()
+        elif tag == "BIRT":
+            for sub in child.get_child_elements():
+                sub_tag = sub.get_tag()
+                if sub_tag == "DATE":
+                    birth_token = sub.get_value().split()[-1]
+                elif sub_tag == "PLAC":
+                    birth_place = sub.get_value()
+        elif tag == "DEAT":
+            for sub in child.get_child_elements():
+                if sub.get_tag() == "DATE":
+                    death_date = sub.get_value()
+    
+    # Birth year is the last token of the birth date, if it is a number
+    # (python-gedcom reports anything else as -1)
     try:
-        parser = Parser()
-        parser.parse_file(temp_path, strict=False)
-        return parser
-    finally:
-        os.unlink(temp_path)
-
-
-def get_individual_data(element: IndividualElement) -> dict[str, Any]:
-    """Extract data from an individual element."""
-    first_name, last_name = element.get_name()
-    birth_year = element.get_birth_year()
-    death_year = -1
-    
-    # Try to get death year
-    death_data = element.get_death_data()
-    if death_data and death_data[0]:
-        try:
-            # Extract year from death date string
-            death_str = death_data[0]
-            for part in death_str.split():
-                if part.isdigit() and len(part) == 4:
-                    death_year = int(part)
-                    break
-        except (ValueError, AttributeError):
-            pass
-    
-    birth_data = element.get_birth_data()
-    birth_place = birth_data[1] if birth_data and len(birth_data) > 1 else None
-    
-    return {
+        birth_year = int(birth_token) if birth_token else None
+    except ValueError:
+        birth_year = None
+    if birth_year == -1:
+        birth_year = None
+    # Death year is the first standalone 4-digit year in the death date
+    death_year = _extract_year(death_date)
+    
+    data = {
         "id": element.get_pointer(),
         "firstName": first_name,
         "lastName": last_name,
         "fullName": f"{first_name} {last_name}".strip(),
-        "gender": element.get_gender(),
-        "birthYear": birth_year if birth_year != -1 else None,
-        "deathYear": death_year if death_year != -1 else None,
+        "gender": gender,
+        "birthYear": birth_year,
+        "deathYear": death_year,
         "birthPlace": birth_place,
     }
+    
+    if cache is not None:
+        cache[data["id"]] = data
+        return dict(data)
+    return data
+
+
+def _build_tree(
+    index: _IndividualIndex,
+    pointer: str,
+    depth: int,
+    max_depth: int,
+    adjacency: dict[str, list[str]],
+    direction: str | None = None,
+    drop_children_at_max_depth: bool = False,
+    memo: dict[tuple[str, int], dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """
+    Build a D3.js-style node for `pointer` and its relatives along `adjacency`
+    (parents_of or children_of) with an explicit stack instead of recursion.
+    Nodes at max_depth get an empty "children" list unless
+    drop_children_at_max_depth is set; other leaves have no "children" key.
+    
+    A subtree depends only on the person and how many levels remain below
+    them, so the memo is keyed on (pointer, max_depth - depth): a person
+    reached again with the same remaining depth (pedigree collapse) reuses the
+    node already built. Pass the same memo to several calls with matching
+    direction and leaf settings to share nodes across them.
+    """
+    # Bind lookups to locals; this loop runs once per node in the tree
+    by_id = index.by_id
+    data_cache = index.data
+    
+    def make_node(node_pointer: str) -> dict[str, Any]:
+        node = get_individual_data(by_id[node_pointer], data_cache)
+        if direction is not None:
+            node["direction"] = direction
+        return node
+    
+    if memo is None:
+        memo = {}
+    root = memo.get((pointer, max_depth - depth))
+    if root is not None:
+        return root
+    
+    root = memo[(pointer, max_depth - depth)] = make_node(pointer)
+    stack = [(root, pointer, depth)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, node_pointer, node_depth = pop()
+        if node_depth >= max_depth:
+            if not drop_children_at_max_depth:
+                node["children"] = []
+            continue
+        
+        # Leaf nodes get no children array at all
+        relatives = adjacency[node_pointer]
+        if not relatives:
+            continue
+        
+        children = node["children"] = []
+        child_depth = node_depth + 1
+        child_remaining = max_depth - child_depth
+        # Children on the depth boundary are finished here rather than pushed,
+        # so their relatives are never looked up
+        at_boundary = child_depth >= max_depth
+        for relative_id in relatives:
+            child = memo.get((relative_id, child_remaining))
+            if child is None:
+                child = memo[(relative_id, child_remaining)] = make_node(relative_id)
+                if not at_boundary:
+                    push((child, relative_id, child_depth))
+                elif not drop_children_at_max_depth:
+                    child["children"] = []
+            children.append(child)
+    
+    return root
 
 
 def build_ancestor_tree(parser: Parser, person_id: str, max_depth: int = 10) -> dict[str, Any] | None:
@@ -801,39 +1245,13 @@ def build_ancestor_tree(parser: Parser, person_id: str, max_depth: int = 10) ->
     Returns a D3.js-compatible hierarchical structure.
     """
     # Find the person
-    person = None
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            if element.get_pointer() == person_id:
-                person = element
-                break
+    index = _get_indiv_index(parser)
+    person = index.by_id.get(person_id)
     
     if not person:
         return None
     
-    def build_node(individual: IndividualElement, depth: int) -> dict[str, Any]:
-        """Recursively build tree node with ancestors as children."""
-        node = get_individual_data(individual)
-        node["children"] = []
-        
-        if depth >= max_depth:
-            return node
-        
-        # Find parents using the parser's get_parents method
-        parents = parser.get_parents(individual)
-        
-        for parent in parents:
-            if isinstance(parent, IndividualElement):
-                parent_node = build_node(parent, depth + 1)
-                node["children"].append(parent_node)
-        
-        # Remove empty children array for leaf nodes
-        if not node["children"]:
-            del node["children"]
-        
-        return node
-    
-    return build_node(person, 0)
+    return _build_tree(index, person_id, 0, max_depth, index.parents_of)
 
 
 def build_descendant_tree(parser: Parser, person_id: str, max_depth: int = 10) -> dict[str, Any] | None:
@@ -842,51 +1260,13 @@ def build_descendant_tree(parser: Parser, person_id: str, max_depth: int = 10) -
     Returns a D3.js-compatible hierarchical structure.
     """
     # Find the person
-    person = None
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            if element.get_pointer() == person_id:
-                person = element
-                break
+    index = _get_indiv_index(parser)
+    person = index.by_id.get(person_id)
     
     if not person:
         return None
     
-    # Build a map of family relationships
-    families: dict[str, FamilyElement] = {}
-    for element in parser.get_root_child_elements():
-        if isinstance(element, FamilyElement):
-            families[element.get_pointer()] = element
-    
-    def get_children(individual: IndividualElement) -> list[IndividualElement]:
-        """Get all children of an individual."""
-        children = []
-        for family in parser.get_families(individual):
-            if isinstance(family, FamilyElement):
-                for child in parser.get_family_members(family, "CHIL"):
-                    if isinstance(child, IndividualElement):
-                        children.append(child)
-        return children
-    
-    def build_node(individual: IndividualElement, depth: int) -> dict[str, Any]:
-        """Recursively build tree node with descendants as children."""
-        node = get_individual_data(individual)
-        node["children"] = []
-        
-        if depth >= max_depth:
-            return node
-        
-        for child in get_children(individual):
-            child_node = build_node(child, depth + 1)
-            node["children"].append(child_node)
-        
-        # Remove empty children array for leaf nodes
-        if not node["children"]:
-            del node["children"]
-        
-        return node
-    
-    return build_node(person, 0)
+    return _build_tree(index, person_id, 0, max_depth, index.children_of)
 
 
 def build_bidirectional_tree(parser: Parser, person_id: str, ancestor_depth: int = 5, descendant_depth: int = 5) -> dict[str, Any] | None:
@@ -899,83 +1279,36 @@ def build_bidirectional_tree(parser: Parser, person_id: str, ancestor_depth: int
     - descendants on the left (using "descendants" property)
     """
     # Find the person
-    person = None
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            if element.get_pointer() == person_id:
-                person = element
-                break
+    index = _get_indiv_index(parser)
+    person = index.by_id.get(person_id)
     
     if not person:
         return None
     
-    def get_children_elements(individual: IndividualElement) -> list[IndividualElement]:
-        """Get all children of an individual."""
-        children = []
-        for family in parser.get_families(individual):
-            if isinstance(family, FamilyElement):
-                for child in parser.get_family_members(family, "CHIL"):
-                    if isinstance(child, IndividualElement):
-                        children.append(child)
-        return children
-    
-    def build_ancestor_node(individual: IndividualElement, depth: int) -> dict[str, Any]:
-        """Recursively build tree node with ancestors as children."""
-        node = get_individual_data(individual)
-        node["direction"] = "ancestor"
-        node["children"] = []
-        
-        if depth >= ancestor_depth:
-            del node["children"]
-            return node
-        
-        parents = parser.get_parents(individual)
-        for parent in parents:
-            if isinstance(parent, IndividualElement):
-                parent_node = build_ancestor_node(parent, depth + 1)
-                node["children"].append(parent_node)
-        
-        if not node["children"]:
-            del node["children"]
-        
-        return node
-    
-    def build_descendant_node(individual: IndividualElement, depth: int) -> dict[str, Any]:
-        """Recursively build tree node with descendants as children."""
-        node = get_individual_data(individual)
-        node["direction"] = "descendant"
-        node["children"] = []
-        
-        if depth >= descendant_depth:
-            del node["children"]
-            return node
-        
-        for child in get_children_elements(individual):
-            child_node = build_descendant_node(child, depth + 1)
-            node["children"].append(child_node)
-        
-        if not node["children"]:
-            del node["children"]
-        
-        return node
-    
     # Build the root node with both directions
-    root_node = get_individual_data(person)
+    root_node = get_individual_data(person, index.data)
     root_node["direction"] = "root"
     
-    # Build ancestors (parents, grandparents, etc.)
+    # Build ancestors (parents, grandparents, etc.), sharing repeated subtrees
     ancestors = []
-    for parent in parser.get_parents(person):
-        if isinstance(parent, IndividualElement):
-            ancestors.append(build_ancestor_node(parent, 1))
+    ancestor_memo = {}
+    for parent_id in index.parents_of[person_id]:
+        ancestors.append(_build_tree(
+            index, parent_id, 1, ancestor_depth, index.parents_of,
+            direction="ancestor", drop_children_at_max_depth=True, memo=ancestor_memo
+        ))
     
     if ancestors:
         root_node["ancestors"] = ancestors
     
-    # Build descendants (children, grandchildren, etc.)
+    # Build descendants (children, grandchildren, etc.), sharing repeated subtrees
     descendants = []
-    for child in get_children_elements(person):
-        descendants.append(build_descendant_node(child, 1))
+    descendant_memo = {}
+    for child_id in index.children_of[person_id]:
+        descendants.append(_build_tree(
+            index, child_id, 1, descendant_depth, index.children_of,
+            direction="descendant", drop_children_at_max_depth=True, memo=descendant_memo
+        ))
     
     if descendants:
         root_node["descendants"] = descendants
@@ -983,108 +1316,153 @@ def build_bidirectional_tree(parser: Parser, person_id: str, ancestor_depth: int
     return root_node
 
 
+def iter_individuals(parser: Parser) -> Iterator[dict[str, Any]]:
+    """Yield data for each individual in the GEDCOM file, in file order."""
+    index = _get_indiv_index(parser)
+    for element in index.individuals:
+        yield _individual_summary(index, element)
+
+
 def get_all_individuals(parser: Parser) -> list[dict[str, Any]]:
     """Get a list of all individuals in the GEDCOM file."""
-    individuals = []
-    
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            individuals.append(get_individual_data(element))
-    
-    return individuals
+    return list(iter_individuals(parser))
 
 
 def find_root_ancestors(parser: Parser) -> list[dict[str, Any]]:
     """Find individuals who have no parents (root ancestors)."""
     roots = []
+    index = _get_indiv_index(parser)
     
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            parents = parser.get_parents(element)
-            if not parents:
-                roots.append(get_individual_data(element))
+    for element in index.individuals:
+        if not index.parents_of[element.get_pointer()]:
+            roots.append(_individual_summary(index, element))
     
     return roots
 
 
 def find_youngest_generation(parser: Parser) -> list[dict[str, Any]]:
     """Find individuals who have no children (youngest generation)."""
-    youngest = []
-    
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            # Check if this person appears as a parent in any family
-            is_parent = False
-            for family in parser.get_root_child_elements():
-                if isinstance(family, FamilyElement):
-                    parents = list(parser.get_family_members(family, "HUSB")) + \
-                              list(parser.get_family_members(family, "WIFE"))
-                    if element in parents:
-                        children = list(parser.get_family_members(family, "CHIL"))
-                        if children:
-                            is_parent = True
-                            break
-            
-            if not is_parent:
-                youngest.append(get_individual_data(element))
-    
-    return youngest
+    index = _get_indiv_index(parser)
+    # Skip anyone who is a parent in a family with children
+    return [
+        _individual_summary(index, element)
+        for element in index.individuals
+        if element.get_pointer() not in index.is_parent
+    ]
 
 
 # ============================================================================
 # GEDCOM Write Operations - Individual Creation
 # ============================================================================
 
+# Characters str.splitlines() breaks on; values containing any need CONT lines
+_LINE_BREAK_RE = re.compile('[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _new_element(level: int, tag: str, value: str) -> Element:
+    """
+    Create a pointer-less element for the write helpers.
+    
+    python-gedcom's default multi-line handling formats the GEDCOM line to
+    measure it before splitting the value into CONC/CONT children; a single
+    line that already fits in 255 characters is stored as-is instead.
+    """
+    if len(value) + len(str(level)) + len(tag) + 2 <= 255 and not _LINE_BREAK_RE.search(value):
+        return Element(level, '', tag, value, multi_line=False)
+    return Element(level=level, pointer='', tag=tag, value=value)
+
+
+# CHAN DATE/TIME strings for the current second, shared by records created in it
+_change_stamp: tuple[int, str, str] = (-1, "", "")
+
+
+def _change_date_strings() -> tuple[str, str]:
+    """Return the GEDCOM CHAN date ("15 MAR 2024") and time ("14:03:59") for now."""
+    global _change_stamp
+    seconds = int(time.time())
+    if _change_stamp[0] != seconds:
+        now = datetime.fromtimestamp(seconds)
+        _change_stamp = (seconds, now.strftime("%d %b %Y").upper(), now.strftime("%H:%M:%S"))
+    return _change_stamp[1], _change_stamp[2]
+
+
+def _add_change_date(record: Element) -> None:
+    """Attach a CHAN / DATE / TIME block stamped with the current time to a record."""
+    chan_date, chan_time = _change_date_strings()
+    chan_elem = _new_element(level=1, tag='CHAN', value='')
+    date_elem = _new_element(level=2, tag='DATE', value=chan_date)
+    date_elem.add_child_element(_new_element(level=3, tag='TIME', value=chan_time))
+    chan_elem.add_child_element(date_elem)
+    record.add_child_element(chan_elem)
+
+
+# Highest numeric suffix of "@I<n>@" / "@F<n>@" / "@S<n>@" root records, per
+# parser. Unlike the individual index this survives writes: added records
+# always take the next generated ID, so the maximum is bumped in place.
+_MAX_IDS: WeakKeyDictionary[Parser, dict[str, int]] = WeakKeyDictionary()
+
+_RECORD_ID_RE = re.compile(r'@([IFS])(\d+)@')
+
+
+# Root record tag each generated ID prefix belongs to
+_ID_KIND_TAGS = {"I": "INDI", "F": "FAM", "S": "SOUR"}
+
+
+def _scan_max_ids(parser: Parser) -> dict[str, int]:
+    """Find the highest I/F/S ID numbers in one pass over the root records."""
+    max_ids = {"I": 0, "F": 0, "S": 0}
+    match_id = _RECORD_ID_RE.fullmatch
+    for element in parser.get_root_child_elements():
+        match = match_id(element.get_pointer())
+        if match:
+            kind, num = match.groups()
+            if element.get_tag() == _ID_KIND_TAGS[kind] and int(num) > max_ids[kind]:
+                max_ids[kind] = int(num)
+    return max_ids
+
+
+def _get_max_ids(parser: Parser) -> dict[str, int]:
+    """Return the cached highest I/F/S ID numbers, scanning the records on first use."""
+    max_ids = _MAX_IDS.get(parser)
+    if max_ids is None:
+        max_ids = _MAX_IDS[parser] = _scan_max_ids(parser)
+    return max_ids
+
+
+def _note_new_id(parser: Parser, pointer: str) -> None:
+    """Advance the cached maximum after a record with a generated ID is added."""
+    max_ids = _MAX_IDS.get(parser)
+    match = _RECORD_ID_RE.fullmatch(pointer)
+    if max_ids is not None and match:
+        kind, num = match.group(1), int(match.group(2))
+        if num > max_ids[kind]:
+            max_ids[kind] = num
+
+
 def generate_new_individual_id(parser: Parser) -> str:
     """Generate a new unique individual ID."""
-    existing_ids = []
-    for element in parser.get_root_child_elements():
-        if isinstance(element, IndividualElement):
-            pointer = element.get_pointer()
-            if pointer:
-                # Extract number from @I123@ format
-                try:
-                    num = int(pointer.strip('@').strip('I'))
-                    existing_ids.append(num)
-                except (ValueError, AttributeError):
-                    pass
-    
-    max_id = max(existing_ids) if existing_ids else 0
-    return f"@I{max_id + 1}@"
+    return f"@I{_get_max_ids(parser)['I'] + 1}@"
 
 
 def generate_new_family_id(parser: Parser) -> str:
     """Generate a new unique family ID."""
-    existing_ids = []
-    for element in parser.get_root_child_elements():
-        if isinstance(element, FamilyElement):
-            pointer = element.get_pointer()
-            if pointer:
-                # Extract number from @F123@ format
-                try:
-                    num = int(pointer.strip('@').strip('F'))
-                    existing_ids.append(num)
-                except (ValueError, AttributeError):
-                    pass
-    
-    max_id = max(existing_ids) if existing_ids else 0
-    return f"@F{max_id + 1}@"
+    return f"@F{_get_max_ids(parser)['F'] + 1}@"
 
 
 def generate_new_source_id(parser: Parser) -> str:
     """Generate a new unique source ID."""
-    existing_ids = []
-    for element in parser.get_root_child_elements():
-        if element.get_tag() == "SOUR" and element.get_pointer():
-            pointer = element.get_pointer()
-            try:
-                num = int(pointer.strip('@').strip('S'))
-                existing_ids.append(num)
-            except (ValueError, AttributeError):
-                pass
-    
-    max_id = max(existing_ids) if existing_ids else 0
-    return f"@S{max_id + 1}@"
+    return f"@S{_get_max_ids(parser)['S'] + 1}@"
+
+
+# Day, GEDCOM month abbreviation and year, e.g. "15 MAR 1850"
+_SIMPLE_DATE_RE = re.compile(r'\d{1,2} [A-Z]{3} \d{4}')
+
+# Auto-correct common month name variations
+_MONTH_CORRECTIONS = {
+    "JANUARY": "JAN", "FEBRUARY": "FEB", "MARCH": "MAR", "APRIL": "APR",
+    "JUNE": "JUN", "JULY": "JUL", "AUGUST": "AUG", "SEPTEMBER": "SEP",
+    "OCTOBER": "OCT", "NOVEMBER": "NOV", "DECEMBER": "DEC"
+}
 
 
 def validate_and_correct_date(date_str: str | None) -> tuple[str | None, list[str]]:
@@ -1105,32 +1483,19 @@ def validate_and_correct_date(date_str: str | None) -> tuple[str | None, list[st
     
     date_str = date_str.strip().upper()
     
-    # Valid GEDCOM date modifiers
-    valid_modifiers = ["ABT", "CAL", "EST", "BEF", "AFT", "BET", "FROM", "TO"]
+    # Most dates are already "15 MAR 1850"; nothing to correct there
+    if _SIMPLE_DATE_RE.fullmatch(date_str):
+        return date_str, warnings
     
     # Check for basic validity - should contain at least a year
-    parts = date_str.split()
-    has_year = any(p.isdigit() and len(p) == 4 for p in parts)
-    
-    if not has_year:
+    if _YEAR_RE.search(date_str) is None:
         warnings.append(f"Date '{date_str}' does not contain a valid 4-digit year. Treating as approximate.")
         return f"ABT {date_str}", warnings
     
-    # GEDCOM month abbreviations
-    valid_months = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", 
-                   "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
-    
-    # Auto-correct common month name variations
-    month_corrections = {
-        "JANUARY": "JAN", "FEBRUARY": "FEB", "MARCH": "MAR", "APRIL": "APR",
-        "JUNE": "JUN", "JULY": "JUL", "AUGUST": "AUG", "SEPTEMBER": "SEP",
-        "OCTOBER": "OCT", "NOVEMBER": "NOV", "DECEMBER": "DEC"
-    }
-    
     corrected_parts = []
-    for part in parts:
-        if part in month_corrections:
-            corrected = month_corrections[part]
+    for part in date_str.split():
+        corrected = _MONTH_CORRECTIONS.get(part)
+        if corrected:
             warnings.append(f"Corrected month '{part}' to '{corrected}'")
             corrected_parts.append(corrected)
         else:
@@ -1145,26 +1510,24 @@ def check_date_consistency(birth_date: str | None, death_date: str | None,
     Check logical consistency of dates.
     Returns list of warnings/errors.
     """
+    return _check_date_consistency(birth_date, death_date, parent_birth_date)[0]
+
+
+def _check_date_consistency(birth_date: str | None, death_date: str | None,
+                            parent_birth_date: str | None = None) -> tuple[list[str], bool]:
+    """Check logical consistency of dates; returns (warnings, has_error)."""
     warnings = []
+    has_error = False
     
-    def extract_year(date_str: str | None) -> int | None:
-        """Extract year from GEDCOM date string."""
-        if not date_str:
-            return None
-        parts = date_str.split()
-        for part in parts:
-            if part.isdigit() and len(part) == 4:
-                return int(part)
-        return None
-    
-    birth_year = extract_year(birth_date)
-    death_year = extract_year(death_date)
-    parent_birth_year = extract_year(parent_birth_date)
+    birth_year = _extract_year(birth_date)
+    death_year = _extract_year(death_date)
+    parent_birth_year = _extract_year(parent_birth_date)
     
     # Check birth before death
     if birth_year and death_year:
         if death_year < birth_year:
             warnings.append(f"ERROR: Death year ({death_year}) is before birth year ({birth_year})")
+            has_error = True
         elif death_year - birth_year > 120:
             warnings.append(f"WARNING: Age at death ({death_year - birth_year}) exceeds 120 years")
     
@@ -1173,10 +1536,11 @@ def check_date_consistency(birth_date: str | None, death_date: str | None,
         parent_age = birth_year - parent_birth_year
         if parent_age < 10:
             warnings.append(f"ERROR: Parent age at child's birth ({parent_age}) is too young (< 10)")
+            has_error = True
         elif parent_age > 80:
             warnings.append(f"WARNING: Parent age at child's birth ({parent_age}) exceeds 80 years")
     
-    return warnings
+    return warnings, has_error
 
 
 def detect_circular_ancestry(parser: Parser, person_id: str, potential_parent_id: str) -> bool:
@@ -1184,30 +1548,37 @@ def detect_circular_ancestry(parser: Parser, person_id: str, potential_parent_id
     Check if adding potential_parent as parent of person would create circular ancestry.
     Returns True if circular relationship detected.
     """
-    # Build set of all ancestors of potential_parent
-    def get_all_ancestors(pid: str, visited: set[str] = None) -> set[str]:
-        if visited is None:
-            visited = set()
-        if pid in visited:
-            return visited
-        visited.add(pid)
+    index = _get_indiv_index(parser)
+    # Parsed pointers are interned, so comparisons against an interned target
+    # usually succeed on identity
+    normalized_person_id = sys.intern(_normalize_id(person_id))
+    
+    ancestors = index.ancestors.get(potential_parent_id)
+    if ancestors is not None:
+        return normalized_person_id in ancestors
+    
+    # Walk the ancestors of potential_parent breadth-first; if person is among
+    # them we'd create a cycle, so stop as soon as they turn up
+    queue = deque([potential_parent_id])
+    visited = {potential_parent_id}
+    while queue:
+        pid = queue.popleft()
+        if pid == normalized_person_id:
+            return True
         
-        individual = find_individual_by_id(parser, pid)
+        individual = index.id_lookup.get(pid)
         if not individual:
-            return visited
+            continue
         
-        parents = parser.get_parents(individual)
-        for parent in parents:
-            if isinstance(parent, IndividualElement):
-                get_all_ancestors(parent.get_pointer(), visited)
-        
-        return visited
-    
-    ancestors_of_potential_parent = get_all_ancestors(potential_parent_id)
+        for parent_id in index.parents_of[individual.get_pointer()]:
+            if parent_id not in visited:
+                visited.add(parent_id)
+                queue.append(parent_id)
     
-    # If person_id is in ancestors of potential_parent, we'd create a cycle
-    normalized_person_id = person_id if person_id.startswith('@') else f"@{person_id}@"
-    return normalized_person_id in ancestors_of_potential_parent
+    # The walk covered every ancestor, so keep the set for further checks
+    # against the same parent until the next write drops the index
+    index.ancestors[potential_parent_id] = frozenset(visited)
+    return False
 
 
 def add_individual(
@@ -1238,8 +1609,6 @@ def add_individual(
     Returns:
         dict with 'id', 'warnings', and 'success' fields
     """
-    from gedcom.element.element import Element
-    
     warnings = []
     
     # Validate gender
@@ -1255,11 +1624,11 @@ def add_individual(
     warnings.extend(death_warnings)
     
     # Check date consistency
-    consistency_warnings = check_date_consistency(birth_date, death_date)
+    consistency_warnings, has_error = _check_date_consistency(birth_date, death_date)
     warnings.extend(consistency_warnings)
     
-    # Check for ERROR level warnings
-    if any("ERROR:" in w for w in warnings):
+    # Check for ERROR level warnings (only the consistency check emits them)
+    if has_error:
         return {
             "success": False,
             "warnings": warnings,
@@ -1270,69 +1639,65 @@ def add_individual(
     new_id = generate_new_individual_id(parser)
     
     # Create individual element
-    indi = IndividualElement(level=0, pointer=new_id, tag='INDI', value='')
+    indi = IndividualElement(level=0, pointer=new_id, tag='INDI', value='', multi_line=False)
     
     # Add NAME
-    name_elem = Element(level=1, pointer='', tag='NAME', value=f"{first_name} /{last_name}/")
+    name_elem = _new_element(level=1, tag='NAME', value=f"{first_name} /{last_name}/")
     indi.add_child_element(name_elem)
     
     # Add GIVN and SURN substructures
-    givn = Element(level=2, pointer='', tag='GIVN', value=first_name)
-    surn = Element(level=2, pointer='', tag='SURN', value=last_name)
+    givn = _new_element(level=2, tag='GIVN', value=first_name)
+    surn = _new_element(level=2, tag='SURN', value=last_name)
     name_elem.add_child_element(givn)
     name_elem.add_child_element(surn)
     
     # Add SEX
-    sex_elem = Element(level=1, pointer='', tag='SEX', value=gender)
+    sex_elem = _new_element(level=1, tag='SEX', value=gender)
     indi.add_child_element(sex_elem)
     
     # Add BIRT event
     if birth_date or birth_place:
-        birth_elem = Element(level=1, pointer='', tag='BIRT', value='')
+        birth_elem = _new_element(level=1, tag='BIRT', value='')
         indi.add_child_element(birth_elem)
         
         if birth_date:
-            date_elem = Element(level=2, pointer='', tag='DATE', value=birth_date)
+            date_elem = _new_element(level=2, tag='DATE', value=birth_date)
             birth_elem.add_child_element(date_elem)
         
         if birth_place:
-            place_elem = Element(level=2, pointer='', tag='PLAC', value=birth_place)
+            place_elem = _new_element(level=2, tag='PLAC', value=birth_place)
             birth_elem.add_child_element(place_elem)
     
     # Add DEAT event
     if death_date or death_place:
-        death_elem = Element(level=1, pointer='', tag='DEAT', value='')
+        death_elem = _new_element(level=1, tag='DEAT', value='')
         indi.add_child_element(death_elem)
         
         if death_date:
-            date_elem = Element(level=2, pointer='', tag='DATE', value=death_date)
+            date_elem = _new_element(level=2, tag='DATE', value=death_date)
             death_elem.add_child_element(date_elem)
         
         if death_place:
-            place_elem = Element(level=2, pointer='', tag='PLAC', value=death_place)
+            place_elem = _new_element(level=2, tag='PLAC', value=death_place)
             death_elem.add_child_element(place_elem)
     
     # Add NOTEs
     if notes:
         for note_text in notes:
-            note_elem = Element(level=1, pointer='', tag='NOTE', value=note_text)
+            note_elem = _new_element(level=1, tag='NOTE', value=note_text)
             indi.add_child_element(note_elem)
     
     # Add CHAN (change date)
-    chan_elem = Element(level=1, pointer='', tag='CHAN', value='')
-    indi.add_child_element(chan_elem)
-    
-    date_elem = Element(level=2, pointer='', tag='DATE', value=datetime.now().strftime("%d %b %Y").upper())
-    chan_elem.add_child_element(date_elem)
-    
-    time_elem = Element(level=3, pointer='', tag='TIME', value=datetime.now().strftime("%H:%M:%S"))
-    date_elem.add_child_element(time_elem)
+    _add_change_date(indi)
     
     # Add to parser
     parser.get_root_element().add_child_element(indi)
+    _note_new_id(parser, new_id)
+    _add_to_record_lookup(parser, indi)
     
     # Invalidate cache so the new individual is properly found
     parser.invalidate_cache()
+    _invalidate_indiv_index(parser)
     
     # Record operation for transaction-based undo
     record_operation({
@@ -1378,65 +1743,58 @@ def create_source_record(
     Returns:
         dict with 'id' and 'success' fields
     """
-    from gedcom.element.element import Element
-    
     # Generate new source ID
     source_id = generate_new_source_id(parser)
     
     # Create source element
-    sour = Element(level=0, pointer=source_id, tag='SOUR', value='')
+    sour = Element(level=0, pointer=source_id, tag='SOUR', value='', multi_line=False)
     
     # Add TITL (required)
-    titl = Element(level=1, pointer='', tag='TITL', value=title)
+    titl = _new_element(level=1, tag='TITL', value=title)
     sour.add_child_element(titl)
     
     # Add AUTH (optional)
     if author:
-        auth = Element(level=1, pointer='', tag='AUTH', value=author)
+        auth = _new_element(level=1, tag='AUTH', value=author)
         sour.add_child_element(auth)
     
     # Add PUBL (optional)
     if publication:
-        publ = Element(level=1, pointer='', tag='PUBL', value=publication)
+        publ = _new_element(level=1, tag='PUBL', value=publication)
         sour.add_child_element(publ)
     
     # Add ABBR (optional)
     if abbreviation:
-        abbr = Element(level=1, pointer='', tag='ABBR', value=abbreviation)
+        abbr = _new_element(level=1, tag='ABBR', value=abbreviation)
         sour.add_child_element(abbr)
     
     # Add TEXT (optional)
     if text:
-        text_elem = Element(level=1, pointer='', tag='TEXT', value=text)
+        text_elem = _new_element(level=1, tag='TEXT', value=text)
         sour.add_child_element(text_elem)
     
     # Add URL as NOTE
     if url:
-        note = Element(level=1, pointer='', tag='NOTE', value=f"URL: {url}")
+        note = _new_element(level=1, tag='NOTE', value=f"URL: {url}")
         sour.add_child_element(note)
     
     # Add repository if provided
     if repository_name:
         # For simplicity, we'll add repository name as NOTE
         # Full REPO implementation would require separate REPO records
-        repo_note = Element(level=1, pointer='', tag='NOTE', value=f"Repository: {repository_name}")
+        repo_note = _new_element(level=1, tag='NOTE', value=f"Repository: {repository_name}")
         sour.add_child_element(repo_note)
     
     # Add CHAN (change date)
-    chan_elem = Element(level=1, pointer='', tag='CHAN', value='')
-    sour.add_child_element(chan_elem)
-    
-    date_elem = Element(level=2, pointer='', tag='DATE', value=datetime.now().strftime("%d %b %Y").upper())
-    chan_elem.add_child_element(date_elem)
-    
-    time_elem = Element(level=3, pointer='', tag='TIME', value=datetime.now().strftime("%H:%M:%S"))
-    date_elem.add_child_element(time_elem)
+    _add_change_date(sour)
     
     # Add to parser
     parser.get_root_element().add_child_element(sour)
+    _note_new_id(parser, source_id)
     
     # Invalidate cache so the new source is properly found
     parser.invalidate_cache()
+    _invalidate_indiv_index(parser)
     
     # Record operation for transaction-based undo
     record_operation({
@@ -1475,15 +1833,12 @@ def attach_source_citation(
     Returns:
         dict with 'success' field
     """
-    from gedcom.element.element import Element
-    
     individual = find_individual(parser, person_id)
     if not individual:
         return {"success": False, "error": f"Person not found: {person_id}"}
     
     # Normalize source_id
-    if not source_id.startswith('@'):
-        source_id = f"@{source_id}@"
+    source_id = _normalize_id(source_id)
     
     # Find or create the event element
     event_elem = None
@@ -1494,29 +1849,29 @@ def attach_source_citation(
     
     if not event_elem:
         # Create the event if it doesn't exist
-        event_elem = Element(level=1, pointer='', tag=event_type, value='')
+        event_elem = _new_element(level=1, tag=event_type, value='')
         individual.add_child_element(event_elem)
     
     # Create SOUR citation
-    sour_elem = Element(level=2, pointer='', tag='SOUR', value=source_id)
+    sour_elem = _new_element(level=2, tag='SOUR', value=source_id)
     event_elem.add_child_element(sour_elem)
     
     # Add PAGE (specific location in source)
     if page:
-        page_elem = Element(level=3, pointer='', tag='PAGE', value=page)
+        page_elem = _new_element(level=3, tag='PAGE', value=page)
         sour_elem.add_child_element(page_elem)
     
     # Add QUAY (quality assessment)
     if quality in (0, 1, 2, 3):
-        quay_elem = Element(level=3, pointer='', tag='QUAY', value=str(quality))
+        quay_elem = _new_element(level=3, tag='QUAY', value=str(quality))
         sour_elem.add_child_element(quay_elem)
     
     # Add DATA with extracted text
     if citation_text:
-        data_elem = Element(level=3, pointer='', tag='DATA', value='')
+        data_elem = _new_element(level=3, tag='DATA', value='')
         sour_elem.add_child_element(data_elem)
         
-        text_elem = Element(level=4, pointer='', tag='TEXT', value=citation_text)
+        text_elem = _new_element(level=4, tag='TEXT', value=citation_text)
         data_elem.add_child_element(text_elem)
     
     # Record operation for transaction-based undo
@@ -1550,46 +1905,45 @@ def create_family_record(
     Returns:
         dict with 'id' and 'success' fields
     """
-    from gedcom.element.element import Element
-    
     # Generate new family ID
     family_id = generate_new_family_id(parser)
     
     # Create family element
-    fam = FamilyElement(level=0, pointer=family_id, tag='FAM', value='')
+    fam = FamilyElement(level=0, pointer=family_id, tag='FAM', value='', multi_line=False)
     
     # Add HUSB (husband)
     if husband_id:
-        if not husband_id.startswith('@'):
-            husband_id = f"@{husband_id}@"
-        husb = Element(level=1, pointer='', tag='HUSB', value=husband_id)
+        husband_id = _normalize_id(husband_id)
+        husb = _new_element(level=1, tag='HUSB', value=husband_id)
         fam.add_child_element(husb)
     
     # Add WIFE
     if wife_id:
-        if not wife_id.startswith('@'):
-            wife_id = f"@{wife_id}@"
-        wife = Element(level=1, pointer='', tag='WIFE', value=wife_id)
+        wife_id = _normalize_id(wife_id)
+        wife = _new_element(level=1, tag='WIFE', value=wife_id)
         fam.add_child_element(wife)
     
     # Add MARR event
     if marriage_date or marriage_place:
-        marr_elem = Element(level=1, pointer='', tag='MARR', value='')
+        marr_elem = _new_element(level=1, tag='MARR', value='')
         fam.add_child_element(marr_elem)
         
         if marriage_date:
-            date_elem = Element(level=2, pointer='', tag='DATE', value=marriage_date)
+            date_elem = _new_element(level=2, tag='DATE', value=marriage_date)
             marr_elem.add_child_element(date_elem)
         
         if marriage_place:
-            place_elem = Element(level=2, pointer='', tag='PLAC', value=marriage_place)
+            place_elem = _new_element(level=2, tag='PLAC', value=marriage_place)
             marr_elem.add_child_element(place_elem)
     
     # Add to parser
     parser.get_root_element().add_child_element(fam)
+    _note_new_id(parser, family_id)
+    _add_to_record_lookup(parser, fam)
     
-    # Invalidate cache so the new family is found by get_families()
+    # Invalidate caches so the new family shows up in index.families
     parser.invalidate_cache()
+    _invalidate_indiv_index(parser)
     
     # Record operation for transaction-based undo
     referenced_individuals = []
@@ -1626,36 +1980,30 @@ def add_child_to_family(
     Returns:
         dict with 'success' field
     """
-    from gedcom.element.element import Element
-    
     # Normalize IDs
-    if not family_id.startswith('@'):
-        family_id = f"@{family_id}@"
-    if not child_id.startswith('@'):
-        child_id = f"@{child_id}@"
+    family_id = _normalize_id(family_id)
+    child_id = _normalize_id(child_id)
     
     # Find family
-    family = None
-    for element in parser.get_root_child_elements():
-        if isinstance(element, FamilyElement) and element.get_pointer() == family_id:
-            family = element
-            break
+    records = _get_record_lookup(parser)
+    family = records.families.get(family_id)
     
     if not family:
         return {"success": False, "error": f"Family not found: {family_id}"}
     
     # Add CHIL reference
-    chil = Element(level=1, pointer='', tag='CHIL', value=child_id)
+    chil = _new_element(level=1, tag='CHIL', value=child_id)
     family.add_child_element(chil)
     
     # Also add FAMC reference to child
-    child = find_individual_by_id(parser, child_id)
+    child = records.individuals.get(child_id)
     if child:
-        famc = Element(level=1, pointer='', tag='FAMC', value=family_id)
+        famc = _new_element(level=1, tag='FAMC', value=family_id)
         child.add_child_element(famc)
     
     # Invalidate cache so relationships are properly found
     parser.invalidate_cache()
+    _invalidate_indiv_index(parser)
     
     return {"success": True}
 
@@ -1682,10 +2030,8 @@ def add_family_relationship(
     warnings = []
     
     # Normalize IDs
-    if not parent_id.startswith('@'):
-        parent_id = f"@{parent_id}@"
-    if not child_id.startswith('@'):
-        child_id = f"@{child_id}@"
+    parent_id = _normalize_id(parent_id)
+    child_id = _normalize_id(child_id)
     
     # Check for circular ancestry
     if check_circular and detect_circular_ancestry(parser, child_id, parent_id):
@@ -1695,8 +2041,9 @@ def add_family_relationship(
         }
     
     # Validate parent/child ages
-    parent = find_individual_by_id(parser, parent_id)
-    child = find_individual_by_id(parser, child_id)
+    records = _get_record_lookup(parser)
+    parent = records.individuals.get(parent_id)
+    child = records.individuals.get(child_id)
     
     if parent and child:
         parent_birth = parent.get_birth_data()
@@ -1706,14 +2053,14 @@ def add_family_relationship(
             parent_birth_date = parent_birth[0] if parent_birth else None
             child_birth_date = child_birth[0] if child_birth else None
             
-            date_warnings = check_date_consistency(
+            date_warnings, has_error = _check_date_consistency(
                 child_birth_date,
                 None,
                 parent_birth_date
             )
             warnings.extend(date_warnings)
             
-            if any("ERROR:" in w for w in warnings):
+            if has_error:
                 return {
                     "success": False,
                     "error": "Age validation failed. Parent too young to have child.",
@@ -1729,39 +2076,28 @@ def add_family_relationship(
         for child_elem in child.get_child_elements():
             if child_elem.get_tag() == "FAMC":
                 # Child already has a family
-                existing_family_id = child_elem.get_value()
-                for element in parser.get_root_child_elements():
-                    if isinstance(element, FamilyElement) and element.get_pointer() == existing_family_id:
-                        existing_family = element
-                        break
+                existing_family = records.families.get(child_elem.get_value())
                 break
     
     if existing_family:
         # Add parent to existing family
         # Check if parent slot is available
-        has_husband = False
-        has_wife = False
-        
-        for fam_child in existing_family.get_child_elements():
-            if fam_child.get_tag() == "HUSB":
-                has_husband = True
-            elif fam_child.get_tag() == "WIFE":
-                has_wife = True
+        family_tags = {fam_child.get_tag() for fam_child in existing_family.get_child_elements()}
+        has_husband = "HUSB" in family_tags
+        has_wife = "WIFE" in family_tags
         
         # Add parent based on gender and availability
-        from gedcom.element.element import Element
-        
         if parent_gender == 'M' and not has_husband:
-            husb = Element(level=1, pointer='', tag='HUSB', value=parent_id)
+            husb = _new_element(level=1, tag='HUSB', value=parent_id)
             existing_family.add_child_element(husb)
         elif parent_gender == 'F' and not has_wife:
-            wife = Element(level=1, pointer='', tag='WIFE', value=parent_id)
+            wife = _new_element(level=1, tag='WIFE', value=parent_id)
             existing_family.add_child_element(wife)
         elif not has_husband:
-            husb = Element(level=1, pointer='', tag='HUSB', value=parent_id)
+            husb = _new_element(level=1, tag='HUSB', value=parent_id)
             existing_family.add_child_element(husb)
         elif not has_wife:
-            wife = Element(level=1, pointer='', tag='WIFE', value=parent_id)
+            wife = _new_element(level=1, tag='WIFE', value=parent_id)
             existing_family.add_child_element(wife)
         else:
             return {
@@ -1771,9 +2107,11 @@ def add_family_relationship(
         
         # Add FAMS reference to parent
         if parent:
-            fams = Element(level=1, pointer='', tag='FAMS', value=existing_family.get_pointer())
+            fams = _new_element(level=1, tag='FAMS', value=existing_family.get_pointer())
             parent.add_child_element(fams)
         
+        _invalidate_indiv_index(parser)
+        
         return {
             "success": True,
             "family_id": existing_family.get_pointer(),
@@ -1800,10 +2138,11 @@ def add_family_relationship(
         
         # Add FAMS reference to parent
         if parent:
-            from gedcom.element.element import Element
-            fams = Element(level=1, pointer='', tag='FAMS', value=family_id)
+            fams = _new_element(level=1, tag='FAMS', value=family_id)
             parent.add_child_element(fams)
         
+        _invalidate_indiv_index(parser)
+        
         return {
             "success": True,
             "family_id": family_id,
@@ -1832,46 +2171,26 @@ def add_spouse_relationship(
     Returns:
         dict with 'success' and 'family_id' fields
     """
-    from gedcom.element.element import Element
-    
     # Normalize IDs
-    if not spouse1_id.startswith('@'):
-        spouse1_id = f"@{spouse1_id}@"
-    if not spouse2_id.startswith('@'):
-        spouse2_id = f"@{spouse2_id}@"
+    spouse1_id = _normalize_id(spouse1_id)
+    spouse2_id = _normalize_id(spouse2_id)
     
     # Get individuals
-    spouse1 = find_individual_by_id(parser, spouse1_id)
-    spouse2 = find_individual_by_id(parser, spouse2_id)
+    records = _get_record_lookup(parser)
+    spouse1 = records.individuals.get(spouse1_id)
+    spouse2 = records.individuals.get(spouse2_id)
     
     if not spouse1:
         return {"success": False, "error": f"Spouse 1 not found: {spouse1_id}"}
     if not spouse2:
         return {"success": False, "error": f"Spouse 2 not found: {spouse2_id}"}
     
-    # Determine husband/wife based on gender
-    gender1 = spouse1.get_gender()
-    gender2 = spouse2.get_gender()
-    
-    husband_id = None
-    wife_id = None
-    
-    if gender1 == 'M' and gender2 == 'F':
-        husband_id = spouse1_id
-        wife_id = spouse2_id
-    elif gender1 == 'F' and gender2 == 'M':
-        husband_id = spouse2_id
-        wife_id = spouse1_id
-    elif gender1 == 'M':
-        husband_id = spouse1_id
-        wife_id = spouse2_id
-    elif gender2 == 'M':
-        husband_id = spouse2_id
-        wife_id = spouse1_id
+    # Determine husband/wife based on gender: spouse1 is the husband unless
+    # spouse2 is the only male
+    if spouse2.get_gender() == 'M' and spouse1.get_gender() != 'M':
+        husband_id, wife_id = spouse2_id, spouse1_id
     else:
-        # Default assignment
-        husband_id = spouse1_id
-        wife_id = spouse2_id
+        husband_id, wife_id = spouse1_id, spouse2_id
     
     # Create family record
     family_result = create_family_record(
@@ -1888,12 +2207,14 @@ def add_spouse_relationship(
     family_id = family_result["id"]
     
     # Add FAMS references to both spouses
-    fams1 = Element(level=1, pointer='', tag='FAMS', value=family_id)
+    fams1 = _new_element(level=1, tag='FAMS', value=family_id)
     spouse1.add_child_element(fams1)
     
-    fams2 = Element(level=1, pointer='', tag='FAMS', value=family_id)
+    fams2 = _new_element(level=1, tag='FAMS', value=family_id)
     spouse2.add_child_element(fams2)
     
+    _invalidate_indiv_index(parser)
+    
     return {
         "success": True,
         "family_id": family_id
@@ -1904,7 +2225,18 @@ def add_spouse_relationship(
 # Duplicate Detection
 # ============================================================================
 
-def calculate_person_similarity(existing: dict[str, Any], candidate: dict[str, Any]) -> float:
+@lru_cache(maxsize=4096)
+def _normalize_place(place: str) -> tuple[str, frozenset[str]]:
+    """Return a place lowercased and stripped, with its comma-separated components."""
+    place = place.lower().strip()
+    return place, frozenset(part.strip() for part in place.split(','))
+
+
+def calculate_person_similarity(
+    existing: dict[str, Any],
+    candidate: dict[str, Any],
+    threshold: float | None = None
+) -> float:
     """
     Calculate similarity score (0.0 to 1.0) between existing person and candidate.
     
@@ -1918,73 +2250,125 @@ def calculate_person_similarity(existing: dict[str, Any], candidate: dict[str, A
     Args:
         existing: PersonMetadata dict from get_person_full_details()
         candidate: dict with 'fullName', 'birthYear', 'birthPlace', 'gender', 'deathYear'
+        threshold: If given, return 0.0 as soon as the score cannot reach it
     
     Returns:
         float: Similarity score 0.0 to 1.0
     """
-    score = 0.0
-    
-    # 1. NAME MATCHING (35 points) - Use Levenshtein distance
-    name_score = 0.0
-    if candidate.get('fullName') and existing.get('fullName'):
-        # SequenceMatcher ratio: 0.0 (completely different) to 1.0 (identical)
-        ratio = SequenceMatcher(
-            None,
-            existing['fullName'].lower(),
-            candidate['fullName'].lower()
-        ).ratio()
-        name_score = ratio * 0.35
-    score += name_score
+    def name_ratio(min_ratio: float) -> float | None:
+        if candidate.get('fullName') and existing.get('fullName'):
+            # Indel similarity: 0.0 (completely different) to 1.0 (identical);
+            # the cutoff lets rapidfuzz give up early on hopeless pairs
+            return fuzz.ratio(
+                existing['fullName'],
+                candidate['fullName'],
+                processor=str.casefold,
+                score_cutoff=max(min_ratio, 0.0) * 100
+            ) / 100.0
+        return None
     
-    # 2. BIRTH YEAR PROXIMITY (25 points)
+    return _score_similarity(existing, candidate, name_ratio, threshold)
+
+
+# Most the name and birth place components can add to a score
+_MAX_NAME_SCORE = 0.35
+_MAX_PLACE_SCORE = 0.20
+_MAX_NAME_PLACE_SCORE = _MAX_NAME_SCORE + _MAX_PLACE_SCORE
+# Most the birth year, gender and death year components can add to a score
+_MAX_YEAR_GENDER_SCORE = 0.25 + 0.10 + 0.10
+
+
+def _min_name_ratio(threshold: float, other_score: float) -> float:
+    """
+    Lowest name ratio that could still reach the threshold, given the year and
+    gender components and a perfect place match (with slack for rounding).
+    """
+    return (threshold - other_score - _MAX_PLACE_SCORE) / _MAX_NAME_SCORE - 1e-9
+
+
+def _score_similarity(
+    existing: dict[str, Any],
+    candidate: dict[str, Any],
+    name_ratio: Callable[[float], float | None],
+    threshold: float | None = None
+) -> float:
+    """
+    Score a pair from its similarity components, asking for the name ratio
+    only if the cheap year and gender components leave the threshold in reach.
+    name_ratio is passed the lowest useful ratio and may return anything
+    below it (e.g. 0.0) when the names are further apart than that.
+    """
+    # BIRTH YEAR PROXIMITY (25 points)
+    birth_score = 0.0
     if existing.get('birthYear') and candidate.get('birthYear'):
         year_diff = abs(existing['birthYear'] - candidate['birthYear'])
         if year_diff == 0:
-            score += 0.25
+            birth_score = 0.25
         elif year_diff <= 1:
-            score += 0.20  # Off by 1 year (record errors common)
+            birth_score = 0.20  # Off by 1 year (record errors common)
         elif year_diff <= 3:
-            score += 0.15  # Off by 2-3 years
+            birth_score = 0.15  # Off by 2-3 years
         elif year_diff <= 5:
-            score += 0.10  # Off by 4-5 years
+            birth_score = 0.10  # Off by 4-5 years
         # else: 0 points for >5 year difference
     
-    # 3. BIRTH PLACE MATCHING (20 points)
-    if existing.get('birthPlace') and candidate.get('birthPlace'):
-        place1 = existing['birthPlace'].lower().strip()
-        place2 = candidate['birthPlace'].lower().strip()
-        
-        # Exact match
-        if place1 == place2:
-            score += 0.20
-        # Contains match (e.g., "Boston, MA" contains "Boston")
-        elif place2 in place1 or place1 in place2:
-            score += 0.15
-        # Split into components and check overlap
-        else:
-            parts1 = set(p.strip() for p in place1.split(','))
-            parts2 = set(p.strip() for p in place2.split(','))
-            if parts1 and parts2:
-                overlap = len(parts1 & parts2) / max(len(parts1), len(parts2))
-                score += overlap * 0.20
-    
-    # 4. GENDER MATCH (10 points)
+    # GENDER MATCH (10 points)
+    gender_score = 0.0
     if existing.get('gender') and candidate.get('gender'):
         if existing['gender'] == candidate['gender']:
-            score += 0.10
+            gender_score = 0.10
         elif 'U' not in (existing['gender'], candidate['gender']):
             # Penalty for definite gender mismatch (unless one is unknown)
-            score -= 0.05
+            gender_score = -0.05
     
-    # 5. DEATH YEAR PROXIMITY (10 points)
+    # DEATH YEAR PROXIMITY (10 points)
+    death_score = 0.0
     if existing.get('deathYear') and candidate.get('deathYear'):
         year_diff = abs(existing['deathYear'] - candidate['deathYear'])
         if year_diff == 0:
-            score += 0.10
+            death_score = 0.10
         elif year_diff <= 2:
-            score += 0.07
+            death_score = 0.07
         elif year_diff <= 5:
-            score += 0.04
+            death_score = 0.04
+    
+    # Skip the name and place comparisons when even perfect matches on both
+    # would leave the score below the threshold (with slack for rounding)
+    min_ratio = 0.0
+    if threshold is not None:
+        best_possible = birth_score + gender_score + death_score + _MAX_NAME_PLACE_SCORE
+        if best_possible + 1e-9 < threshold:
+            return 0.0
+        min_ratio = _min_name_ratio(threshold, birth_score + gender_score + death_score)
+    
+    # NAME MATCHING (35 points) - Use Levenshtein distance
+    name_score = 0.0
+    ratio = name_ratio(min_ratio)
+    if min_ratio > 0 and (ratio is None or ratio < min_ratio):
+        return 0.0
+    if ratio is not None:
+        name_score = ratio * 0.35
+    
+    # BIRTH PLACE MATCHING (20 points)
+    place_score = 0.0
+    if existing.get('birthPlace') and candidate.get('birthPlace'):
+        place1, parts1 = _normalize_place(existing['birthPlace'])
+        place2, parts2 = _normalize_place(candidate['birthPlace'])
+        
+        # Exact match
+        if place1 == place2:
+            place_score = 0.20
+        # Contains match (e.g., "Boston, MA" contains "Boston")
+        elif place2 in place1 or place1 in place2:
+            place_score = 0.15
+        # Compare components for overlap
+        else:
+            if parts1 and parts2:
+                overlap = len(parts1 & parts2) / max(len(parts1), len(parts2))
+                place_score = overlap * 0.20
+    
+    # Sum in the original component order so scores are unchanged
+    score = name_score + birth_score + place_score + gender_score + death_score
     
     return max(0.0, min(1.0, score))  # Clamp to [0.0, 1.0]
 
@@ -2013,26 +2397,49 @@ def find_potential_duplicates(
         ]
         Sorted by similarity score (highest first)
     """
-    matches = []
-    
-    # Get all individuals
-    individuals = get_all_individuals(parser)
-    
-    for person in individuals:
-        # Get full details for better comparison
-        details = get_person_full_details(parser, person['id'])
+    index = _get_indiv_index(parser)
+    
+    # Score the candidate's name against everyone in one rapidfuzz call;
+    # name_choices are the casefolded full names, aligned with index.names.
+    # Names below the ratio no one could reach the threshold with are left
+    # out, which lets rapidfuzz skip them on length alone
+    name_cutoff = max(_min_name_ratio(threshold, _MAX_YEAR_GENDER_SCORE), 0.0)
+    name_ratios = {}
+    if candidate.get('fullName'):
+        for _, ratio, position in process.extract(
+            candidate['fullName'].casefold(),
+            index.name_choices,
+            scorer=fuzz.ratio,
+            limit=None,
+            score_cutoff=name_cutoff * 100
+        ):
+            name_ratios[position] = ratio / 100.0
+    
+    # (score, element) for everyone at or above the threshold
+    scored = []
+    
+    for position, (_, element) in enumerate(index.names):
+        # Score on the cached summary (same name, dates, place and gender as
+        # the full details) and only fetch full details for matches
+        summary = _individual_summary(index, element)
+        score = _score_similarity(
+            summary,
+            candidate,
+            lambda min_ratio: name_ratios.get(position, 0.0) if summary['fullName'] else None,
+            threshold
+        )
         
-        if isinstance(details, dict):  # Not an error string
-            score = calculate_person_similarity(details, candidate)
-            
-            if score >= threshold:
-                matches.append({
-                    'person': details,
-                    'similarity': score,
-                    'percentage': int(score * 100)
-                })
+        if score >= threshold:
+            scored.append((score, element))
     
-    # Sort by score descending (best matches first)
-    matches.sort(key=lambda x: x['similarity'], reverse=True)
+    # Sort by score descending (best matches first), then build the results
+    scored.sort(key=lambda x: x[0], reverse=True)
     
-    return matches
+    return [
+        {
+            'person': _person_full_details(parser, element),
+            'similarity': score,
+            'percentage': int(score * 100)
+        }
+        for score, element in scored
+    ]
@@ -43,6 +43,7 @@ from gedcom_utils import (
     build_bidirectional_tree,
     find_youngest_generation,
     export_gedcom_content,
+    get_person_full_details,
 )
 
 # Load environment variables
@@ -500,7 +501,6 @@ async def get_person_details(person_id: str):
         person_id = f"@{person_id}@"
         logger.debug(f"Normalized person_id to: {person_id}")
     
-    from gedcom_utils import get_person_full_details
     result = get_person_full_details(current_gedcom_parser, person_id)
     
     if isinstance(result, str):
@@ -3,6 +3,8 @@
 Uses the sample-family.ged file (English and British Monarchs) for testing.
 """
 
+import inspect
+import io
 import os
 import pytest
 import sys
@@ -10,6 +12,8 @@ import sys
 # Add backend to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from gedcom.parser import GedcomFormatViolationError, Parser
+
 from gedcom_utils import (
     # Parsing
     parse_gedcom_file,
@@ -22,6 +26,7 @@ from gedcom_utils import (
     get_individual_data,
     get_person_full_details,
     get_all_individuals,
+    iter_individuals,
     # Relationships
     get_parents,
     get_children,
@@ -30,6 +35,9 @@ from gedcom_utils import (
     get_grandparents,
     get_aunts_uncles,
     get_cousins,
+    # Metadata updates
+    update_person_metadata,
+    apply_undo,
     # Tree building
     build_ancestor_tree,
     build_descendant_tree,
@@ -118,6 +126,45 @@ class TestParsing:
         individual = find_individual_by_id(parser, "@I1@")
         assert individual is not None
         
+    def test_parse_gedcom_content_line_endings(self):
+        """Test that CRLF line endings and a byte order mark parse like plain LF."""
+        content = "0 HEAD\n0 @I1@ INDI\n1 NAME José /Smith/\n1 SEX M\n0 TRLR\n"
+        expected = export_gedcom_content(parse_gedcom_content(content))
+        
+        for variant in (content.replace("\n", "\r\n"), "\ufeff" + content):
+            parser = parse_gedcom_content(variant)
+            assert export_gedcom_content(parser) == expected
+            assert find_individual_by_name(parser, "José Smith") is not None
+
+    def test_parse_gedcom_content_quirks(self):
+        """Test that stray continuation text is kept as a CONC line."""
+        content = "0 HEAD\n0 @I1@ INDI\n1 NOTE First part\n and second part\n0 TRLR"
+        parser = parse_gedcom_content(content)
+
+        lines = export_gedcom_content(parser).split("\n")
+        assert "2 CONC and second part" in lines
+        assert lines[-1] == "0 TRLR"
+
+    def test_parser_line_hook_available(self):
+        """Test that the python-gedcom line parser the fast path overrides still exists."""
+        # _GedcomParser replaces and falls back to this private method; a
+        # python-gedcom release that renames it or changes its signature
+        # must fail here rather than at parse time
+        assert hasattr(Parser, "_Parser__parse_line")
+        parameters = list(inspect.signature(Parser._Parser__parse_line).parameters)
+        assert parameters == ["line_number", "line", "last_element", "strict"]
+
+    def test_parse_gedcom_content_level_jump(self):
+        """Test that lines the fast path hands back to python-gedcom are still validated."""
+        content = "0 HEAD\n0 @I1@ INDI\n3 NOTE Too deep\n0 TRLR"
+        with pytest.raises(GedcomFormatViolationError):
+            parse_gedcom_content(content)
+
+    def test_export_round_trip(self, parser):
+        """Test that exported content parses back to the same content."""
+        content = export_gedcom_content(parser)
+        assert export_gedcom_content(parse_gedcom_content(content)) == content
+        
     def test_export_gedcom_content(self, parser):
         """Test exporting GEDCOM to string."""
         content = export_gedcom_content(parser)
@@ -126,6 +173,12 @@ class TestParsing:
         assert "HEAD" in content
         assert "INDI" in content
         
+    def test_export_gedcom_content_to_stream(self, parser):
+        """Test exporting GEDCOM into a file-like object."""
+        out = io.StringIO()
+        assert export_gedcom_content(parser, out) is None
+        assert out.getvalue() == export_gedcom_content(parser)
+        
 
 # ============================================================================
 # Individual Lookup Tests
@@ -163,7 +216,58 @@ class TestIndividualLookup:
         """Test that name search is case insensitive."""
         individual = find_individual_by_name(parser, "elizabeth ii")
         assert individual is not None
+
+    def test_find_individual_by_id_duplicate_pointer(self):
+        """Test that a duplicated pointer resolves to the first record, as a linear scan would."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME First /A/
+0 @I1@ INDI
+1 NAME Second /B/
+0 TRLR"""
+        parser = parse_gedcom_content(content)
         
+        assert find_individual_by_id(parser, "@I1@").get_name() == ("First", "A")
+        assert find_individual_by_id(parser, "I1").get_name() == ("First", "A")
+        assert get_person_full_details(parser, "@I1@")["fullName"] == "First A"
+        # Each record still reports its own data when listed
+        names = [person["fullName"] for person in get_all_individuals(parser)]
+        assert names == ["First A", "Second B"]
+
+    def test_find_individual_by_name_prefers_exact(self):
+        """Test that an exact name match wins over an earlier partial match."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME John /Smithson/
+0 @I2@ INDI
+1 NAME John /Smith/
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        individual = find_individual_by_name(parser, "John Smith")
+        assert individual.get_pointer() == "@I2@"
+
+    def test_find_individual_by_name_casefold(self):
+        """Test that names are compared casefolded, so 'ß' matches 'ss' exactly."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME Anna /Strasser/
+0 @I2@ INDI
+1 NAME Anna /Straße/
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        individual = find_individual_by_name(parser, "ANNA STRASSE")
+        assert individual.get_pointer() == "@I2@"
+
+    def test_find_individual_by_name_fuzzy(self, parser):
+        """Test that a misspelled full name falls back to a fuzzy match."""
+        individual = find_individual_by_name(parser, "Georg V Windsr")
+        assert individual is not None
+        assert individual.get_pointer() == find_individual_by_name(parser, "George V Windsor").get_pointer()
+
+    def test_find_individual_by_name_fuzzy_no_match(self, parser):
+        """Test that unrelated names do not fuzzy match anyone."""
+        assert find_individual_by_name(parser, "Xyzzy Qwerty") is None
+
     def test_find_individual_not_found(self, parser):
         """Test that None is returned for non-existent person."""
         individual = find_individual_by_id(parser, "@I99999@")
@@ -191,6 +295,48 @@ class TestIndividualLookup:
         assert data["birthYear"] == 1926
         assert data["deathYear"] == 2022
         
+    def test_get_individual_data_with_cache(self, parser):
+        """Test that cached individual data is memoized and returned as a copy."""
+        individual = find_individual_by_id(parser, "@I1@")
+        cache = {}
+        
+        data = get_individual_data(individual, cache)
+        data["children"] = []
+        
+        assert "@I1@" in cache
+        assert "children" not in cache["@I1@"]
+        assert get_individual_data(individual, cache) == get_individual_data(individual)
+        
+    def test_get_individual_data_name_parts(self):
+        """Test names given as GIVN/SURN parts and a non-numeric birth date."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME
+2 GIVN Anne
+2 SURN Boleyn
+1 SEX F
+1 BIRT
+2 DATE 1501?
+2 PLAC Blickling Hall
+1 DEAT
+2 DATE 19 MAY 1536
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        data = get_individual_data(find_individual_by_id(parser, "@I1@"))
+        
+        assert data["fullName"] == "Anne Boleyn"
+        assert data["gender"] == "F"
+        assert data["birthYear"] is None
+        assert data["birthPlace"] == "Blickling Hall"
+        assert data["deathYear"] == 1536
+        
+    def test_iter_individuals(self, parser):
+        """Test that iter_individuals lazily yields the same records as get_all_individuals."""
+        iterator = iter_individuals(parser)
+        
+        assert next(iterator)["id"] == get_all_individuals(parser)[0]["id"]
+        assert [p["id"] for p in iter_individuals(parser)] == [p["id"] for p in get_all_individuals(parser)]
+        
     def test_get_person_full_details(self, parser):
         """Test getting comprehensive person details."""
         details = get_person_full_details(parser, "@I0@")
@@ -260,6 +406,23 @@ class TestRelationships:
         assert isinstance(spouses, list)
         assert len(spouses) >= 1
         
+    def test_get_spouses_unknown_gender(self):
+        """Test that a spouse is listed once when gender is unknown."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME Pat /Doe/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Sam /Doe/
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I2@
+1 WIFE @I1@
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        assert [s["id"] for s in get_spouses(parser, "@I1@")] == ["@I2@"]
+        assert [s["id"] for s in get_spouses(parser, "@I2@")] == ["@I1@"]
+        
     def test_get_siblings(self, parser):
         """Test getting siblings of a person."""
         # Charles III has siblings (Anne, Andrew, Edward)
@@ -286,6 +449,42 @@ class TestRelationships:
         cousins = get_cousins(parser, "@I0@")
         assert isinstance(cousins, list)
         
+    def test_relationship_reflects_metadata_update(self, fresh_parser):
+        """Test that relationship results are not served stale after an update."""
+        get_children(fresh_parser, "@I1@")
+        update_person_metadata(fresh_parser, "@I0@", birth_place="Test Place")
+        
+        children = get_children(fresh_parser, "@I1@")
+        charles = next(c for c in children if c["id"] == "@I0@")
+        assert charles["birthPlace"] == "Test Place"
+        
+    def test_metadata_update_reuses_added_tag(self, fresh_parser):
+        """Test that a tag added earlier in the same update is updated, not duplicated."""
+        result = update_person_metadata(
+            fresh_parser, "@I0@", occupation="King", custom_facts={"occu": "Monarch"}
+        )
+        
+        individual = find_individual_by_id(fresh_parser, "@I0@")
+        occupations = [c for c in individual.get_child_elements() if c.get_tag() == "OCCU"]
+        assert len(occupations) == 1
+        assert occupations[0].get_value() == "Monarch"
+        assert [c["field"] for c in result["changes"]] == ["OCCU", "OCCU"]
+        
+    def test_apply_undo_metadata_update(self, fresh_parser):
+        """Test that undoing a metadata update restores old values and removes added tags."""
+        before = get_person_full_details(fresh_parser, "@I0@")
+        result = update_person_metadata(
+            fresh_parser, "@I0@", occupation="King", birth_place="Test Place"
+        )
+        
+        message = apply_undo(fresh_parser, result)
+        assert "Successfully" in message
+        
+        individual = find_individual_by_id(fresh_parser, "@I0@")
+        assert not any(c.get_tag() == "OCCU" for c in individual.get_child_elements())
+        after = get_person_full_details(fresh_parser, "@I0@")
+        assert after["birthPlace"] == before["birthPlace"]
+        
     def test_relationship_not_found(self, parser):
         """Test error handling for non-existent person."""
         result = get_parents(parser, "@I99999@")
@@ -326,6 +525,72 @@ class TestTreeBuilding:
         assert tree["id"] == "@I0@"
         assert tree["direction"] == "root"
         
+    def test_build_descendant_tree_deep_pedigree(self):
+        """Test that very deep trees do not hit the recursion limit."""
+        generations = sys.getrecursionlimit() + 100
+        lines = ["0 HEAD"]
+        for i in range(1, generations + 1):
+            lines += [f"0 @I{i}@ INDI", f"1 NAME Gen{i} /Deep/"]
+            if i > 1:
+                lines.append(f"1 FAMC @F{i - 1}@")
+            if i < generations:
+                lines.append(f"1 FAMS @F{i}@")
+        for i in range(1, generations):
+            lines += [f"0 @F{i}@ FAM", f"1 HUSB @I{i}@", f"1 CHIL @I{i + 1}@"]
+        lines.append("0 TRLR")
+        parser = parse_gedcom_content("\n".join(lines))
+        
+        tree = build_descendant_tree(parser, "@I1@", max_depth=generations)
+        
+        depth = 1
+        node = tree
+        while "children" in node:
+            node = node["children"][0]
+            depth += 1
+        assert depth == generations
+        assert node["id"] == f"@I{generations}@"
+        
+    def test_build_ancestor_tree_pedigree_collapse(self):
+        """Test that an ancestor reached twice at the same depth is built once."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME Grand /Father/
+1 SEX M
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Grand /Mother/
+1 SEX F
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Left /Parent/
+1 SEX M
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Right /Parent/
+1 SEX F
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I5@ INDI
+1 NAME Only /Child/
+1 FAMC @F2@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+0 @F2@ FAM
+1 HUSB @I3@
+1 WIFE @I4@
+1 CHIL @I5@
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        tree = build_ancestor_tree(parser, "@I5@", max_depth=3)
+        
+        left, right = tree["children"]
+        assert [n["id"] for n in left["children"]] == ["@I1@", "@I2@"]
+        assert left["children"][0] is right["children"][0]
+        
     def test_find_root_ancestors(self, parser):
         """Test finding individuals without parents."""
         roots = find_root_ancestors(parser)
@@ -339,6 +604,12 @@ class TestTreeBuilding:
         
         assert isinstance(youngest, list)
         assert len(youngest) > 0
+        
+        # Charles III has children, so he is not in the youngest generation
+        youngest_ids = {person["id"] for person in youngest}
+        assert "@I0@" not in youngest_ids
+        for person_id in list(youngest_ids)[:20]:
+            assert get_children(parser, person_id) == []
 
 
 # ============================================================================
@@ -400,6 +671,18 @@ class TestWriteOperations:
         details = get_person_full_details(fresh_parser, result["id"])
         assert len(details["notes"]) == 2
         
+    def test_add_individual_long_notes(self, fresh_parser):
+        """Test that multi-line and overlong notes are split into CONT/CONC lines."""
+        long_note = "word " * 80
+        result = add_individual(fresh_parser, "Hans", "Mestern", "M",
+                                notes=["First line\nSecond line", long_note])
+
+        assert result["success"] is True
+        content = export_gedcom_content(fresh_parser)
+        assert "1 NOTE First line\n2 CONT Second line" in content
+        assert "2 CONC " in content
+        assert all(len(line) <= 255 for line in content.split("\n"))
+
     def test_add_individual_invalid_gender(self, fresh_parser):
         """Test that invalid gender is corrected with warning."""
         result = add_individual(
@@ -412,7 +695,18 @@ class TestWriteOperations:
         assert result["success"] is True
         assert len(result["warnings"]) > 0
         assert any("gender" in w.lower() for w in result["warnings"])
-        
+
+    def test_add_individual_date_errors(self, fresh_parser):
+        """Test that only inconsistent dates block adding a person."""
+        result = add_individual(fresh_parser, "Test", "Person", "M",
+                                birth_date="1900", death_date="1850")
+        assert result["success"] is False
+
+        # Warning text that merely echoes "error:" from the input is not an error
+        result = add_individual(fresh_parser, "Test", "Person", "M",
+                                birth_date="error: unknown")
+        assert result["success"] is True
+
     def test_create_source_record(self, fresh_parser):
         """Test creating a source record."""
         result = create_source_record(
@@ -493,7 +787,22 @@ class TestWriteOperations:
         parents = get_parents(fresh_parser, child["id"])
         parent_ids = [p["id"] for p in parents]
         assert parent["id"] in parent_ids
-        
+
+    def test_add_family_relationship_second_parent(self, fresh_parser):
+        """Test that a second parent joins the child's existing family."""
+        father = add_individual(fresh_parser, "John", "Smith", "M")["id"]
+        mother = add_individual(fresh_parser, "Jane", "Smith", "F")["id"]
+        extra = add_individual(fresh_parser, "Jim", "Smith", "M")["id"]
+        child = add_individual(fresh_parser, "Jack", "Smith", "M")["id"]
+
+        family_id = add_family_relationship(fresh_parser, father, child)["family_id"]
+        result = add_family_relationship(fresh_parser, mother, child)
+        assert result["success"] is True
+        assert result["family_id"] == family_id
+
+        # Both parent slots are now taken
+        assert add_family_relationship(fresh_parser, extra, child)["success"] is False
+
     def test_add_spouse_relationship(self, fresh_parser):
         """Test linking spouses."""
         person1 = add_individual(fresh_parser, "John", "Smith", "M")
@@ -512,6 +821,28 @@ class TestWriteOperations:
         spouses = get_spouses(fresh_parser, person1["id"])
         spouse_ids = [s["id"] for s in spouses]
         assert person2["id"] in spouse_ids
+        
+    def test_add_spouse_relationship_duplicate_pointer(self):
+        """Test that write helpers link the first record when a pointer is duplicated."""
+        content = """0 HEAD
+0 @I1@ INDI
+1 NAME First /A/
+1 SEX M
+0 @I1@ INDI
+1 NAME Second /B/
+1 SEX M
+0 @I2@ INDI
+1 NAME Wife /C/
+1 SEX F
+0 TRLR"""
+        parser = parse_gedcom_content(content)
+        
+        result = add_spouse_relationship(parser, spouse1_id="@I1@", spouse2_id="@I2@")
+        assert result["success"] is True
+        
+        first, second = [e for e in parser.get_root_child_elements() if e.get_pointer() == "@I1@"]
+        assert any(c.get_tag() == "FAMS" for c in first.get_child_elements())
+        assert not any(c.get_tag() == "FAMS" for c in second.get_child_elements())
 
 
 # ============================================================================
@@ -575,6 +906,23 @@ class TestDuplicateDetection:
         score = calculate_person_similarity(existing, candidate)
         assert score < 0.30  # Should be low
         
+    def test_calculate_person_similarity_threshold(self):
+        """Test that a threshold only short-circuits pairs that cannot reach it."""
+        existing = {
+            "fullName": "John Smith",
+            "birthYear": 1850,
+            "birthPlace": "Boston",
+            "gender": "M",
+            "deathYear": 1920
+        }
+        near = dict(existing, birthYear=1851, deathYear=None)
+        far = dict(existing, birthYear=1900, gender="F", deathYear=1980)
+        
+        assert calculate_person_similarity(existing, near, threshold=0.60) == \
+            calculate_person_similarity(existing, near)
+        assert calculate_person_similarity(existing, far) > 0.0
+        assert calculate_person_similarity(existing, far, threshold=0.60) == 0.0
+        
     def test_find_potential_duplicates(self, parser):
         """Test finding potential duplicates in existing tree."""
         # Search for Elizabeth II
@@ -672,6 +1020,21 @@ class TestValidation:
         is_circular = detect_circular_ancestry(parser, "@I0@", "@I0@")
         assert is_circular is True
 
+    def test_detect_circular_ancestry_descendant(self, parser):
+        """Test that a descendant cannot become a parent."""
+        # Elizabeth II (@I1@) is an ancestor of Charles III (@I0@)
+        is_circular = detect_circular_ancestry(parser, "@I1@", "@I0@")
+        assert is_circular is True
+
+    def test_detect_circular_ancestry_after_write(self, fresh_parser):
+        """Test that a new parent link is seen by later checks."""
+        parent_id = add_individual(fresh_parser, "Cycle", "Parent", "M")["id"]
+        child_id = add_individual(fresh_parser, "Cycle", "Child", "M")["id"]
+        assert detect_circular_ancestry(fresh_parser, parent_id, child_id) is False
+
+        add_family_relationship(fresh_parser, parent_id, child_id)
+        assert detect_circular_ancestry(fresh_parser, parent_id, child_id) is True
+
 
 # ============================================================================
 # ID Generation Tests
@@ -704,6 +1067,15 @@ class TestIDGeneration:
         
         assert new_id.startswith("@S")
         assert new_id.endswith("@")
+        
+    def test_generated_ids_advance_after_writes(self, fresh_parser):
+        """Test that IDs generated after adding records are not reused."""
+        first_source = create_source_record(fresh_parser, "First")["id"]
+        second_source = create_source_record(fresh_parser, "Second")["id"]
+        assert first_source != second_source
+        
+        first_family = create_family_record(fresh_parser)["id"]
+        assert generate_new_family_id(fresh_parser) != first_family
 
 
 # ============================================================================
@@ -784,6 +1156,109 @@ class TestTransactions:
         # Person should be removed
         assert find_individual_by_id(fresh_parser, person_id) is None
 
+    def test_transaction_undo_missing_person_id(self, fresh_parser):
+        """Test that an add_individual operation without a person_id reports a clear error."""
+        record = {"operations": [{"type": "add_individual"}]}
+        undo_result = apply_transaction_undo(fresh_parser, record)
+        
+        assert undo_result["success"] is False
+        assert any("missing person_id" in error for error in undo_result["errors"])
+
+    def test_transaction_undo_error_order(self, fresh_parser):
+        """Test that errors for missing added records are reported in LIFO order."""
+        record = {"operations": [
+            {"type": "unknown_op"},
+            {"type": "add_individual", "person_id": "@I9999@"},
+        ]}
+        undo_result = apply_transaction_undo(fresh_parser, record)
+        
+        assert undo_result["errors"] == [
+            "Could not find person to remove: @I9999@",
+            "Unknown operation type: unknown_op",
+        ]
+
+    def test_transaction_undo_frees_ids(self, fresh_parser):
+        """Test that IDs of undone records are handed out again."""
+        begin_transaction("Add and undo")
+        person_id = add_individual(fresh_parser, "Undo", "Test", "M")["id"]
+        record = commit_transaction()
+        assert generate_new_individual_id(fresh_parser) != person_id
+
+        apply_transaction_undo(fresh_parser, record)
+        assert generate_new_individual_id(fresh_parser) == person_id
+
+    def test_transaction_undo_forgets_removed_records(self, fresh_parser):
+        """Test that undone people can no longer be linked to."""
+        begin_transaction("Add and undo")
+        person_id = add_individual(fresh_parser, "Undo", "Test", "F")["id"]
+        assert add_spouse_relationship(fresh_parser, "@I0@", person_id)["success"] is True
+        record = commit_transaction()
+
+        apply_transaction_undo(fresh_parser, record)
+        result = add_spouse_relationship(fresh_parser, "@I0@", person_id)
+        assert result["success"] is False
+
+    def test_transaction_undo_family(self, fresh_parser):
+        """Test that undoing a family removes it and the spouses' FAMS links."""
+        husband_id = add_individual(fresh_parser, "Undo", "Husband", "M")["id"]
+        wife_id = add_individual(fresh_parser, "Undo", "Wife", "F")["id"]
+        
+        begin_transaction("Add marriage")
+        add_spouse_relationship(fresh_parser, husband_id, wife_id)
+        record = commit_transaction()
+        assert len(get_spouses(fresh_parser, husband_id)) == 1
+        
+        undo_result = apply_transaction_undo(fresh_parser, record)
+        
+        assert undo_result["success"] is True
+        assert get_spouses(fresh_parser, husband_id) == []
+        husband = find_individual_by_id(fresh_parser, husband_id)
+        assert all(c.get_tag() != "FAMS" for c in husband.get_child_elements())
+
+    def test_transaction_undo_citations(self, fresh_parser):
+        """Test that undo removes only the citations the transaction attached."""
+        first_source = create_source_record(fresh_parser, "Existing Source")["id"]
+        attach_source_citation(fresh_parser, "@I0@", first_source)
+        
+        def birth_citations():
+            individual = find_individual_by_id(fresh_parser, "@I0@")
+            birth = next(c for c in individual.get_child_elements() if c.get_tag() == "BIRT")
+            return [c.get_value() for c in birth.get_child_elements() if c.get_tag() == "SOUR"]
+        
+        before = birth_citations()
+        
+        begin_transaction("Cite birth twice")
+        new_source = create_source_record(fresh_parser, "New Source")["id"]
+        attach_source_citation(fresh_parser, "@I0@", new_source)
+        attach_source_citation(fresh_parser, "@I0@", new_source, page="p. 2")
+        record = commit_transaction()
+        
+        undo_result = apply_transaction_undo(fresh_parser, record)
+        
+        assert undo_result["success"] is True
+        assert undo_result["operations_undone"] == 3
+        assert birth_citations() == before
+        
+    def test_transaction_undo_mixed_operations(self, fresh_parser):
+        """Test undoing a transaction that adds people, a family and edits."""
+        initial_individuals = len(get_all_individuals(fresh_parser))
+        initial_spouses = len(get_spouses(fresh_parser, "@I0@"))
+        
+        begin_transaction("Add second spouse")
+        person_id = add_individual(fresh_parser, "Mixed", "Spouse", "F")["id"]
+        add_spouse_relationship(fresh_parser, "@I0@", person_id)
+        source_id = create_source_record(fresh_parser, "Mixed Source")["id"]
+        attach_source_citation(fresh_parser, person_id, source_id)
+        record = commit_transaction()
+        
+        undo_result = apply_transaction_undo(fresh_parser, record)
+        
+        assert undo_result["success"] is True
+        assert undo_result["operations_undone"] == record["operation_count"]
+        assert len(get_all_individuals(fresh_parser)) == initial_individuals
+        assert len(get_spouses(fresh_parser, "@I0@")) == initial_spouses
+        assert find_individual_by_id(fresh_parser, person_id) is None
+
 
 # ============================================================================
 # Integration Tests